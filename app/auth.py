@@ -6,6 +6,7 @@ Extracts user_uid (sub claim) — this is the trusted identity.
 """
 from __future__ import annotations
 
+import hmac
 import logging
 import time
 from typing import Optional
@@ -14,7 +15,7 @@ import httpx
 import jwt
 from fastapi import Header, HTTPException
 
-from app.config import settings
+from app.config import APP_TOKEN_BYTES, AUTH_REQUIRED, settings
 
 logger = logging.getLogger(__name__)
 
@@ -135,7 +136,7 @@ def get_verified_user_uid(
         return claims["sub"]
 
     # Legacy fallback: app_token auth (no user verification)
-    if settings.app_token and x_app_token == settings.app_token:
+    if AUTH_REQUIRED and hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES):
         return ""  # caller must provide user_uid in body/query
 
     raise HTTPException(status_code=401, detail="unauthorized")
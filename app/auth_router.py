@@ -6,6 +6,7 @@ age_range) is collected on first registration and stored in the users table.
 """
 from __future__ import annotations
 
+import hmac
 import logging
 from typing import Optional
 
@@ -13,7 +14,7 @@ from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel, Field
 
 from app.auth import verify_apple_token
-from app.config import settings
+from app.config import APP_TOKEN_BYTES, AUTH_REQUIRED
 from app.db import get_engine
 from sqlalchemy import text
 
@@ -167,7 +168,7 @@ def get_profile(
     if x_apple_id_token:
         claims = verify_apple_token(x_apple_id_token)
         verified_uid = claims["sub"]
-    elif settings.app_token and x_app_token == settings.app_token and user_uid:
+    elif AUTH_REQUIRED and hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES) and user_uid:
         verified_uid = user_uid  # legacy fallback
     else:
         raise HTTPException(status_code=401, detail="unauthorized")
@@ -196,7 +197,7 @@ def update_profile(
     if x_apple_id_token:
         claims = verify_apple_token(x_apple_id_token)
         verified_uid = claims["sub"]
-    elif settings.app_token and x_app_token == settings.app_token and user_uid:
+    elif AUTH_REQUIRED and hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES) and user_uid:
         verified_uid = user_uid
     else:
         raise HTTPException(status_code=401, detail="unauthorized")
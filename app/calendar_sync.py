@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hmac
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -7,7 +8,7 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
 
-from app.config import settings
+from app.config import APP_TOKEN_BYTES, AUTH_REQUIRED
 from app.db import get_engine
 
 from sqlalchemy import text
@@ -45,7 +46,7 @@ class CalendarSyncResponse(BaseModel):
 # Endpoint
 
 def _require_app_token(x_app_token: Optional[str]) -> None:
-    if settings.app_token and x_app_token != settings.app_token:
+    if AUTH_REQUIRED and not hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES):
         raise HTTPException(status_code=403, detail="forbidden")
 
 
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import hmac
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+import orjson
 from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.chat_service import chat_once
-from app.config import settings
+from app.chat_service import chat_once, start_chat_stream
+from app.config import APP_TOKEN_BYTES, AUTH_REQUIRED
 from app.history_repository import (
     create_conversation,
     fetch_history,
@@ -32,34 +35,34 @@ router = APIRouter(prefix="/v1/chat", tags=["chat"])
 
 def _require_app_token(x_app_token: Optional[str]) -> None:
     """Reject requests with a missing or invalid app token."""
-    if settings.app_token and x_app_token != settings.app_token:
+    if AUTH_REQUIRED and not hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES):
         raise HTTPException(status_code=403, detail="forbidden")
 
 
 @router.post("/conversations", response_model=CreateConversationResponse)
-def create_conv(
+async def create_conv(
     req: CreateConversationRequest,
     x_app_token: Optional[str] = Header(default=None),
 ) -> dict:
     _require_app_token(x_app_token)
     try:
-        return create_conversation(req.user_uid, req.title)
+        return await asyncio.to_thread(create_conversation, req.user_uid, req.title)
     except Exception:
         raise HTTPException(status_code=500, detail="create_failed")
 
 
 @router.get("/conversations", response_model=ListConversationsResponse)
-def list_conv(
+async def list_conv(
     user_uid: str,
     x_app_token: Optional[str] = Header(default=None),
 ) -> dict:
     _require_app_token(x_app_token)
-    items = list_conversations(user_uid)
+    items = await asyncio.to_thread(list_conversations, user_uid)
     return {"conversations": items}
 
 
 @router.get("/history", response_model=HistoryResponse)
-def history(
+async def history(
     user_uid: str,
     conversation_id: str,
     limit: int = 50,
@@ -68,7 +71,9 @@ def history(
 ) -> dict:
     _require_app_token(x_app_token)
     try:
-        msgs = fetch_history(user_uid, conversation_id, limit=limit, before_id=before_id)
+        msgs = await asyncio.to_thread(
+            fetch_history, user_uid, conversation_id, limit=limit, before_id=before_id
+        )
         return {"conversation_id": conversation_id, "messages": msgs}
     except LookupError:
         raise HTTPException(status_code=404, detail="not_found")
@@ -82,6 +87,42 @@ def _detect_meditation_request(llm_reply: str) -> bool:
     return _MEDITATION_TAG in llm_reply
 
 
+def _tag_prefix_len(text: str) -> int:
+    """Length of the longest tail of text that could still grow into _MEDITATION_TAG."""
+    for n in range(min(len(text), len(_MEDITATION_TAG) - 1), 0, -1):
+        if text.endswith(_MEDITATION_TAG[:n]):
+            return n
+    return 0
+
+
+async def _strip_meditation_tag(events: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    """
+    Remove _MEDITATION_TAG from streamed deltas, even when split across chunks.
+
+    Any tail that may be the start of the tag is held back until the next
+    delta, and so is trailing whitespace, which _chat_payload strips along with
+    the tag. The deltas then add up to the same reply text as POST /v1/chat.
+    """
+    pending = ""
+    tag_seen = False
+    async for ev in events:
+        if ev.get("done"):
+            tail = pending.rstrip() if tag_seen else pending
+            if tail:
+                yield {"delta": tail}
+            yield ev
+            continue
+        buf = pending + ev["delta"]
+        if _MEDITATION_TAG in buf:
+            tag_seen = True
+            buf = buf.replace(_MEDITATION_TAG, "")
+        ready = buf[: len(buf) - _tag_prefix_len(buf)]
+        text = ready.rstrip()
+        pending = buf[len(text):]
+        if text:
+            yield {"delta": text}
+
+
 async def _generate_meditation_background(
     user_uid: str, conversation_id: str,
 ) -> None:
@@ -99,7 +140,8 @@ async def _generate_meditation_background(
             f"Here's your meditation: {med_result['title']}\n"
             f"[MEDITATION_AUDIO:{med_result['audio_url']}]"
         )
-        insert_message(
+        await asyncio.to_thread(
+            insert_message,
             user_uid=user_uid,
             conversation_id=conversation_id,
             role="assistant",
@@ -119,6 +161,51 @@ async def _generate_meditation_background(
         logger.exception("Background meditation generation failed: %s", exc)
 
 
+def _chat_payload(req: ChatRequest, out: dict) -> dict:
+    """Post-process a chat turn result into the ChatResponse payload."""
+    reply = out["reply"]
+
+    # Detect calendar action in LLM reply
+    cal_keywords = [
+        "add to your calendar", "i'll add", "i've added", "i'll schedule",
+        "i've scheduled", "i'll cancel", "i'll remove", "i'll move",
+        "i've moved", "i'll update", "i've updated", "to your calendar",
+        "i'll create", "i've created", "i'll delete", "i've deleted",
+        "added to your calendar", "scheduled for", "event has been"
+    ]
+    reply_lower = reply.lower()
+    is_calendar = any(kw in reply_lower for kw in cal_keywords)
+
+    # Detect meditation generation request (LLM tag only)
+    is_meditation = _detect_meditation_request(reply)
+
+    # Strip the tag from the reply shown to user
+    if _MEDITATION_TAG in reply:
+        reply = reply.replace(_MEDITATION_TAG, "").strip()
+
+    # Fire-and-forget background meditation generation if triggered
+    if is_meditation:
+        asyncio.create_task(
+            _generate_meditation_background(
+                req.user_uid, req.conversation_id,
+            )
+        )
+
+    return {
+        "conversation_id": req.conversation_id,
+        "reply": reply,
+        "calendar_change": is_calendar,
+        "calendar_command": req.message if is_calendar else None,
+        "used_context": out["used_context"],
+        "hrv_range": req.hrv_range,
+        "rag_k": out["rag_k"],
+        "generate_meditation": is_meditation,
+        "meditation_audio_url": None,
+        "meditation_title": None,
+        "meditation_session_id": None,
+    }
+
+
 @router.post("", response_model=ChatResponse)
 async def chat(
     req: ChatRequest,
@@ -137,50 +224,66 @@ async def chat(
             req.hrv_range,
             rag_k=3,
         )
+        return _chat_payload(req, out)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="conversation_not_found")
+    except Exception as exc:
+        logger.exception("chat_once failed: %s", exc)
+        raise HTTPException(status_code=500, detail="chat_failed")
 
-        reply = out["reply"]
-
-        # Detect calendar action in LLM reply
-        cal_keywords = [
-            "add to your calendar", "i'll add", "i've added", "i'll schedule",
-            "i've scheduled", "i'll cancel", "i'll remove", "i'll move",
-            "i've moved", "i'll update", "i've updated", "to your calendar",
-            "i'll create", "i've created", "i'll delete", "i've deleted",
-            "added to your calendar", "scheduled for", "event has been"
-        ]
-        reply_lower = reply.lower()
-        is_calendar = any(kw in reply_lower for kw in cal_keywords)
-
-        # Detect meditation generation request (LLM tag only)
-        is_meditation = _detect_meditation_request(reply)
-
-        # Strip the tag from the reply shown to user
-        if _MEDITATION_TAG in reply:
-            reply = reply.replace(_MEDITATION_TAG, "").strip()
-
-        # Fire-and-forget background meditation generation if triggered
-        if is_meditation:
-            asyncio.create_task(
-                _generate_meditation_background(
-                    req.user_uid, req.conversation_id,
-                )
-            )
 
-        return {
-            "conversation_id": req.conversation_id,
-            "reply": reply,
-            "calendar_change": is_calendar,
-            "calendar_command": req.message if is_calendar else None,
-            "used_context": out["used_context"],
-            "hrv_range": req.hrv_range,
-            "rag_k": out["rag_k"],
-            "generate_meditation": is_meditation,
-            "meditation_audio_url": None,
-            "meditation_title": None,
-            "meditation_session_id": None,
-        }
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    """Format one Server-Sent Events frame."""
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {orjson.dumps(data).decode()}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(
+    req: ChatRequest,
+    x_app_token: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    """
+    Same as POST /v1/chat but streams the reply as Server-Sent Events.
+
+    Frames: `data: {"delta": "..."}` per chunk, then one `event: done`
+    frame whose data is the full ChatResponse payload. The meditation tag is
+    stripped from both, so the deltas add up to the done frame's reply.
+    Failures after streaming has started are sent as `event: error`.
+    """
+    _require_app_token(x_app_token)
+
+    if not allow(req.user_uid):
+        raise HTTPException(status_code=429, detail="rate_limited")
+
+    try:
+        events = await start_chat_stream(
+            req.user_uid,
+            req.conversation_id,
+            req.message,
+            req.hrv_range,
+            rag_k=3,
+        )
     except LookupError:
         raise HTTPException(status_code=404, detail="conversation_not_found")
     except Exception as exc:
-        logger.exception("chat_once failed: %s", exc)
+        logger.exception("chat stream setup failed: %s", exc)
         raise HTTPException(status_code=500, detail="chat_failed")
+
+    async def _frames() -> AsyncIterator[str]:
+        try:
+            async for ev in _strip_meditation_tag(events):
+                if ev.get("done"):
+                    yield _sse(_chat_payload(req, ev), event="done")
+                else:
+                    yield _sse({"delta": ev["delta"]})
+        except Exception as exc:
+            logger.exception("chat stream failed: %s", exc)
+            yield _sse({"detail": "chat_failed"}, event="error")
+
+    # no-cache / X-Accel-Buffering stop proxies (nginx) from buffering frames
+    return StreamingResponse(
+        _frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
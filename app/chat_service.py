@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 from app.calendar_sync import format_calendar_context
-import json
+import itertools
 import logging
 import time
-from typing import Any, Dict, List
+from bisect import bisect_right
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Set, Tuple
+
+import orjson
 
 from app.history_repository import (
-    count_messages,
-    fetch_history,
+    fetch_history_with_total,
     fetch_messages_for_summarization,
-    fetch_recent_message_ids,
     get_cross_chat_profile,
     get_or_create_summary,
     insert_message,
@@ -25,7 +27,7 @@ if settings.hrv_local:
 else:
     from app.hrv_client import fetch_hrv_context
 from app.memory_service import extract_and_store_memories, retrieve_memories, update_cross_chat_profile
-from app.openai_client import call_gpt, call_gpt_mem0
+from app.openai_client import call_gpt_async, call_gpt_mem0, call_gpt_stream
 from app.prompts import (
     CHAT_SYSTEM_PROMPT,
     MEDITATION_GENERATION_MEDIUM_PROMPT,
@@ -34,7 +36,7 @@ from app.prompts import (
     SUMMARIZATION_USER_TEMPLATE,
 )
 from app.rag_service import retrieve_rag
-from app.token_budget import MAX_TOKENS, count_tokens, trim_text_to_tokens
+from app.token_budget import MAX_TOKENS, count_tokens, count_tokens_batch, trim_text_to_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -46,20 +48,98 @@ _HISTORY_TOKEN_TRIGGER = _cfg.chat_history_token_trigger
 _RAG_CHUNK_TOKENS = _cfg.chat_rag_chunk_tokens
 _RAG_MAX_CHUNKS = _cfg.chat_rag_max_chunks
 _SUMMARY_MAX_TOKENS = _cfg.chat_summary_max_tokens
+_SUMMARY_COMPLETION_TOKENS = _cfg.chat_summary_completion_tokens
+_HRV_CACHE_TTL = _cfg.hrv_cache_ttl
+_HRV_CACHE_MAX = _cfg.hrv_cache_max_entries
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected mid-flight
+_BACKGROUND_TASKS: Set[asyncio.Task] = set()
+
+
+def _on_background_done(task: asyncio.Task) -> None:
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background task failed: %r", task.exception())
+
+
+def _spawn_background(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """Schedule a coroutine without awaiting it; failures are logged, not raised."""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
+
 
+# Conversations with a background summarization in flight (one at a time each)
+_SUMMARIZING: Set[str] = set()
 
+# Remote HRV API only: (user_uid, hrv_range) -> (expires_at, task).
+# Concurrent turns share the in-flight task.
+_HRV_CACHE: Dict[Tuple[str, str], Tuple[float, "asyncio.Task[Dict[str, Any]]"]] = {}
+
+
+def _evict_failed_hrv(key: Tuple[str, str], task: "asyncio.Task[Dict[str, Any]]") -> None:
+    """Done callback: drop the entry if its fetch failed, was cancelled or came back empty."""
+    if not task.cancelled() and task.exception() is None and task.result():
+        return
+    hit = _HRV_CACHE.get(key)
+    if hit is not None and hit[1] is task:
+        del _HRV_CACHE[key]
+
+
+async def _fetch_hrv_cached(user_uid: str, hrv_range: str) -> Dict[str, Any]:
+    """
+    fetch_hrv_context, with a short per-(user, range) TTL cache for the remote HRV API.
+
+    The remote API serves precomputed aggregates, so turns seconds apart reuse
+    the previous result; empty results (no data or fetch error) are not kept.
+    The local Apple path is not cached: it reads mindfulness / calm-score
+    sessions that the ingest and session endpoints update at any time.
+    """
+    if settings.hrv_local:
+        return await fetch_hrv_context(user_uid, hrv_range, mode=settings.hrv_mode)
+
+    key = (user_uid, hrv_range)
+    now = time.monotonic()
+    hit = _HRV_CACHE.get(key)
+    if hit is not None and hit[0] > now:
+        return await asyncio.shield(hit[1])
+
+    if len(_HRV_CACHE) >= _HRV_CACHE_MAX:
+        for k in [k for k, (exp, _) in _HRV_CACHE.items() if exp <= now]:
+            del _HRV_CACHE[k]
+        while len(_HRV_CACHE) >= _HRV_CACHE_MAX:
+            _HRV_CACHE.pop(next(iter(_HRV_CACHE)))
+
+    task = asyncio.create_task(fetch_hrv_context(user_uid, hrv_range))
+    # Evict from the task itself, so a cancelled first caller cannot leave a
+    # failed or empty result cached for the full TTL
+    task.add_done_callback(functools.partial(_evict_failed_hrv, key))
+    _HRV_CACHE[key] = (now + _HRV_CACHE_TTL, task)
+    return await asyncio.shield(task)
+
+
+@functools.lru_cache(maxsize=1)
 def _system_prompt() -> str:
     return CHAT_SYSTEM_PROMPT
 
 
+# Static prompt fragments are tokenized once per process (+4 = message overhead)
+_SYS_PROMPT_TOKENS = count_tokens(_system_prompt()) + 4
+_RAG_SEP_TOKENS = count_tokens("\n- ")
+_RAG_HEADER_TOKENS = count_tokens("RAG_CONTEXT:\n- ")
+
+
+_SUMMARY_ROLE_PREFIX = {"user": "USER: ", "assistant": "ASSISTANT: "}
+
+
 def _summarization_prompt(existing_summary: str, messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
-    lines = []
-    for m in messages:
-        role = m.get("role", "")
-        content = m.get("content", "")
-        if role in ("user", "assistant"):
-            lines.append(f"{role.upper()}: {content}")
-    history_text = "\n".join(lines)
+    prefix = _SUMMARY_ROLE_PREFIX
+    history_text = "\n".join(
+        prefix[m["role"]] + m["content"]
+        for m in messages
+        if m.get("role") in prefix and m.get("content")
+    )
 
     existing_block = f"EXISTING SUMMARY:\n{existing_summary}\n\n" if existing_summary else ""
     user_content = SUMMARIZATION_USER_TEMPLATE.format(
@@ -72,49 +152,57 @@ def _summarization_prompt(existing_summary: str, messages: List[Dict[str, Any]])
     ]
 
 
-async def _maybe_summarize(conversation_id: str, user_uid: str) -> str:
+async def _maybe_summarize(
+    conversation_id: str,
+    user_uid: str,
+    total: int,
+    summary_row: Dict[str, Any],
+    recent_ids: List[int],
+) -> str:
     """
     Trigger rolling summarization when:
       - total messages > _SUMMARIZE_THRESHOLD, OR
       - older messages (outside recent window) exceed _HISTORY_TOKEN_TRIGGER tokens.
-    Returns the current rolling summary text.
+
+    total, summary_row and recent_ids are fetched by the caller alongside the
+    other per-turn reads. Returns the current rolling summary text.
     """
-    total = count_messages(conversation_id)
-    summary_row = get_or_create_summary(conversation_id, user_uid)
     current_summary = summary_row.get("summary") or ""
     last_summarized_id = summary_row.get("summarized_through_message_id")
 
-    recent_ids = fetch_recent_message_ids(conversation_id, n=_RECENT_TURNS)
     if not recent_ids:
         return current_summary
 
     cutoff_id = recent_ids[0]  # oldest ID in the recent window
 
+    # Single fetch serves both the token-trigger check and the summarization input
+    to_summarize = await asyncio.to_thread(
+        fetch_messages_for_summarization,
+        conversation_id,
+        user_uid,
+        after_id=last_summarized_id,
+        before_id=cutoff_id,
+    )
+    if not to_summarize:
+        return current_summary
+
     if total <= _SUMMARIZE_THRESHOLD:
         # Check token-based trigger even when message count is low
-        older = fetch_messages_for_summarization(
-            conversation_id, after_id=last_summarized_id, before_id=cutoff_id
-        )
-        older_tokens = sum(count_tokens(m.get("content") or "") for m in older)
+        older_tokens = sum(count_tokens_batch([m.get("content") or "" for m in to_summarize]))
         if older_tokens < _HISTORY_TOKEN_TRIGGER:
             return current_summary
-        to_summarize = older
-    else:
-        to_summarize = fetch_messages_for_summarization(
-            conversation_id,
-            after_id=last_summarized_id,
-            before_id=cutoff_id,
-        )
-
-    if not to_summarize:
-        return current_summary
 
     try:
         prompt = _summarization_prompt(current_summary, to_summarize)
-        new_summary = await asyncio.to_thread(call_gpt_mem0, prompt)
+        new_summary = await asyncio.to_thread(
+            call_gpt_mem0, prompt, max_completion_tokens=_SUMMARY_COMPLETION_TOKENS
+        )
+        if not new_summary:
+            # Empty completion (e.g. cap hit during reasoning) — keep the old summary
+            return current_summary
         new_summary = trim_text_to_tokens(new_summary, _SUMMARY_MAX_TOKENS)
         max_id = max(m["id"] for m in to_summarize)
-        update_summary(conversation_id, max_id, new_summary)
+        await asyncio.to_thread(update_summary, conversation_id, user_uid, max_id, new_summary)
         return new_summary
     except Exception as exc:
         logger.warning("Summarization failed: %s", exc)
@@ -266,56 +354,34 @@ def _build_prompt(
       1. System prompt (always)
       2. Rolling summary (Layer 3)
       3. Long-term memories (Layer 2)
-      4. HRV context (compact)
+      4. HRV + calendar context (compact, one message)
       5. RAG snippets (≤20 chunks, ≤300 tokens each)
       6. Recent messages (Layer 1 — short-term window)
       7. User message (appended by caller)
 
     Returns (messages, token_breakdown).
     """
-    messages: List[Dict[str, str]] = []
-    breakdown: Dict[str, int] = {
-        "tokens_system": 0,
-        "tokens_summary": 0,
-        "tokens_memory": 0,
-        "tokens_history": 0,
-        "tokens_hrv": 0,
-
-        "tokens_rag": 0,
-        "tokens_total": 0,
-    }
-
     # 1. System prompt — always
     sys_content = _system_prompt()
-    messages.append({"role": "system", "content": sys_content})
-    used = count_tokens(sys_content) + 4
-    breakdown["tokens_system"] = used
 
     # 2. Rolling summary (Layer 3)
-    if summary:
-        block = f"SESSION_SUMMARY:\n{summary}"
-        tok = count_tokens(block) + 4
-        messages.append({"role": "system", "content": block})
-        used += tok
-        breakdown["tokens_summary"] = tok
+    summary_block = f"SESSION_SUMMARY:\n{summary}" if summary else ""
 
     # 3. Long-term memories (Layer 2)
     mem_block = ""
     if memories:
         mem_block = "USER_MEMORIES:\n- " + "\n- ".join(memories)
-    mem_tok = count_tokens(mem_block) + 4 if mem_block else 0
 
     # 3b. Cross-chat user profile
     profile_block = ""
     if cross_chat_profile:
         profile_block = f"USER_PROFILE:\n{cross_chat_profile}"
-    profile_tok = count_tokens(profile_block) + 4 if profile_block else 0
 
-    # Pre-compute HRV context as compact CSV-like strings (no repeated keys)
-    hrv_block = ""
-    if hrv_context:
-        hrv_block = _format_hrv_compact(hrv_context)
-    hrv_tok = count_tokens(hrv_block) + 4 if hrv_block else 0
+    # Pre-compute HRV context as compact CSV-like strings (no repeated keys).
+    # Calendar context shares the same system message: one message overhead, one count.
+    hrv_block = "\n\n".join(
+        b for b in (_format_hrv_compact(hrv_context) if hrv_context else "", calendar_context) if b
+    )
 
     # RAG chunks (trim each to 300 tokens)
     trimmed_snips: List[str] = []
@@ -324,84 +390,76 @@ def _build_prompt(
         if text:
             trimmed_snips.append(trim_text_to_tokens(text, _RAG_CHUNK_TOKENS))
 
-    # History blocks
-    history_blocks: List[Dict[str, str]] = [
-        {"role": m["role"], "content": m["content"]}
+    # History blocks as (role, content)
+    history_blocks: List[Tuple[str, str]] = [
+        (m["role"], m["content"])
         for m in history[-_RECENT_TURNS:]
         if m.get("role") in ("user", "assistant") and m.get("content")
     ]
 
+    # Tokenize every variable-length piece in one batch call (+4 = message overhead)
+    fixed_blocks = [summary_block, mem_block, profile_block, hrv_block]
+    counts = count_tokens_batch(
+        fixed_blocks
+        + [user_message]
+        + trimmed_snips
+        + [content for _, content in history_blocks]
+    )
+    summary_tok, mem_tok, profile_tok, hrv_tok = (
+        c + 4 if block else 0 for block, c in zip(fixed_blocks, counts)
+    )
     # Reserve tokens for user message (appended outside this function)
-    user_tok = count_tokens(user_message) + 4
+    user_tok = counts[4] + 4
+    snip_tok = counts[5 : 5 + len(trimmed_snips)]
+    hist_tok_list = [c + 4 for c in counts[5 + len(trimmed_snips) :]]
 
     # --- Budget enforcement ---
-    # Fixed overhead already used
-    # Try to fit all; reduce RAG then history if over budget
+    # Fixed overhead (system, summary, memories, profile, HRV, user turn) always fits;
+    # fill RAG greedily, then keep as much recent history as the remainder allows.
+    # Candidates are priced via cumulative sums over the per-item counts above.
+    # rag_cum[n-1]: RAG block with the first n snippets; hist_cum[n-1]: newest n history blocks
+    rag_cum = [
+        p + i * _RAG_SEP_TOKENS + _RAG_HEADER_TOKENS + 4
+        for i, p in enumerate(itertools.accumulate(snip_tok))
+    ]
+    hist_cum = list(itertools.accumulate(reversed(hist_tok_list)))
 
     def _rag_tok(n: int) -> int:
-        if n == 0:
-            return 0
-        return count_tokens("\n- ".join(trimmed_snips[:n])) + 4
+        return rag_cum[n - 1] if n > 0 else 0
 
     def _hist_tok(n: int) -> int:
-        return sum(count_tokens(b["content"]) + 4 for b in history_blocks[-n:]) if n > 0 else 0
-
-    rag_n = len(trimmed_snips)
-    hist_n = len(history_blocks)
-
-    # Reduce RAG first: 20→10→5→0
-    for candidate_rag in (rag_n, 10, 5, 0):
-        candidate_rag = min(candidate_rag, rag_n)
-        for candidate_hist in (hist_n, 12, 8, 4, 0):
-            candidate_hist = min(candidate_hist, hist_n)
-            total = used + mem_tok + profile_tok + hrv_tok + _rag_tok(candidate_rag) + _hist_tok(candidate_hist) + user_tok
-            if total <= MAX_TOKENS:
-                rag_n = candidate_rag
-                hist_n = candidate_hist
-                break
-        else:
-            continue
-        break
-
-    # 3. Long-term memories (Layer 2)
-    if mem_block:
-        messages.append({"role": "system", "content": mem_block})
-        used += mem_tok
-    breakdown["tokens_memory"] = mem_tok
+        return hist_cum[n - 1] if n > 0 else 0
 
-    # 3b. Cross-chat user profile
-    if profile_block:
-        messages.append({"role": "system", "content": profile_block})
-        used += profile_tok
-
-    # 4. HRV context (single compact block)
-    if hrv_block:
-        messages.append({"role": "system", "content": hrv_block})
-        used += hrv_tok
-    breakdown["tokens_hrv"] = hrv_tok
-
-    # 4b. Calendar context
-    if calendar_context:
-        cal_tok = count_tokens(calendar_context) + 4
-        messages.append({"role": "system", "content": calendar_context})
-        used += cal_tok
+    fixed = _SYS_PROMPT_TOKENS + summary_tok + mem_tok + profile_tok + hrv_tok + user_tok
+    rag_n, hist_n = len(trimmed_snips), len(history_blocks)
+    # Fast path: the full context usually fits, so only search when it overflows
+    if fixed + _rag_tok(rag_n) + _hist_tok(hist_n) > MAX_TOKENS:
+        rag_n = bisect_right(rag_cum, MAX_TOKENS - fixed)
+        hist_n = bisect_right(hist_cum, MAX_TOKENS - fixed - _rag_tok(rag_n))
 
     # 5. RAG snippets (knowledge base)
-    if rag_n > 0:
-        rag_block = "RAG_CONTEXT:\n- " + "\n- ".join(trimmed_snips[:rag_n])
-        rt = _rag_tok(rag_n)
-        messages.append({"role": "system", "content": rag_block})
-        used += rt
-        breakdown["tokens_rag"] = rt
-
-    # 6. History turns
-    final_history = history_blocks[-hist_n:] if hist_n > 0 else []
-    messages.extend(final_history)
-    ht = _hist_tok(hist_n)
-    used += ht
-    breakdown["tokens_history"] = ht
-
-    breakdown["tokens_total"] = used + user_tok
+    rag_block = "RAG_CONTEXT:\n- " + "\n- ".join(trimmed_snips[:rag_n]) if rag_n > 0 else ""
+
+    # System blocks in priority order (2. summary, 3. memories, 3b. profile,
+    # 4. HRV + calendar, 5. RAG), then 6. the newest hist_n turns; built once.
+    parts: List[Tuple[str, str]] = [
+        ("system", block)
+        for block in (sys_content, summary_block, mem_block, profile_block, hrv_block, rag_block)
+        if block
+    ]
+    if hist_n > 0:
+        parts.extend(history_blocks[-hist_n:])
+    messages = [{"role": role, "content": content} for role, content in parts]
+
+    breakdown: Dict[str, int] = {
+        "tokens_system": _SYS_PROMPT_TOKENS,
+        "tokens_summary": summary_tok,
+        "tokens_memory": mem_tok,
+        "tokens_history": _hist_tok(hist_n),
+        "tokens_hrv": hrv_tok,
+        "tokens_rag": _rag_tok(rag_n),
+    }
+    breakdown["tokens_total"] = fixed + breakdown["tokens_rag"] + breakdown["tokens_history"]
     return messages, breakdown
 
 
@@ -423,42 +481,64 @@ async def _update_cross_chat_profile_bg(
         logger.warning("Cross-chat profile update failed: %s", exc)
 
 
-async def chat_once(
+async def _prepare_turn(
     user_uid: str,
     conversation_id: str,
     user_message: str,
     hrv_range: str,
-    rag_k: int = 3,
+    rag_k: int,
 ) -> Dict[str, Any]:
+    """Persist the user turn, gather context and build the prompt for one chat turn."""
     t0 = time.time()
 
-    # Persist user turn
-    insert_message(user_uid, conversation_id, role="user", content=user_message)
-
-    # Parallel: history (sync) + HRV (async) + RAG (thread) + memories (thread)
-    history = fetch_history(user_uid, conversation_id, limit=_RECENT_TURNS + 2)
-    hrv_task = asyncio.create_task(
-        fetch_hrv_context(user_uid, hrv_range)
-        if not settings.hrv_local
-        else fetch_hrv_context(user_uid, hrv_range, mode=settings.hrv_mode)
-    )
-    rag_hits = await asyncio.to_thread(retrieve_rag, user_message, user_uid, "documents1")
-
-    # Layer 2: retrieve long-term memories (semantic search on user facts)
-    memories = await asyncio.to_thread(retrieve_memories, user_uid, user_message)
-
+    # One parallel wave: user-turn insert + DB reads (threads) + HRV (async, cached)
+    # + RAG (async) + memories / profile / calendar (threads)
     # Cross-chat user profile
-    cross_chat_profile = ""
-    if settings.cross_chat_memory_enabled:
-        cross_chat_profile = await asyncio.to_thread(get_cross_chat_profile, user_uid)
-
-    hrv_context = await hrv_task
-    # Calendar context (from synced events)
-    calendar_block = await asyncio.to_thread(format_calendar_context, user_uid)
-    # Calendar context (from synced events)
-
-    # Layer 3: summarize old messages if needed (runs in background of this request)
-    summary = await _maybe_summarize(conversation_id, user_uid)
+    profile_coro = (
+        asyncio.to_thread(get_cross_chat_profile, user_uid)
+        if settings.cross_chat_memory_enabled
+        else asyncio.sleep(0, result="")
+    )
+    (
+        user_msg_id,
+        (history, total),
+        summary_row,
+        hrv_context,
+        rag_hits,
+        memories,
+        cross_chat_profile,
+        calendar_block,
+    ) = await asyncio.gather(
+        # Persist user turn
+        asyncio.to_thread(
+            insert_message, user_uid, conversation_id, role="user", content=user_message
+        ),
+        asyncio.to_thread(
+            fetch_history_with_total, user_uid, conversation_id, limit=_RECENT_TURNS + 2
+        ),
+        asyncio.to_thread(get_or_create_summary, conversation_id, user_uid),
+        _fetch_hrv_cached(user_uid, hrv_range),
+        retrieve_rag(user_message, user_uid, "documents1"),
+        # Layer 2: retrieve long-term memories (semantic search on user facts)
+        asyncio.to_thread(retrieve_memories, user_uid, user_message),
+        profile_coro,
+        # Calendar context (from synced events)
+        asyncio.to_thread(format_calendar_context, user_uid),
+    )
+    # The history read races the user-turn insert; drop the current turn so the
+    # prompt is the same either way (the user message is appended last below).
+    history = [m for m in history if m["id"] != user_msg_id]
+    # Recent window (ascending IDs, ending with this turn) derived from the same read
+    recent_ids = ([m["id"] for m in history] + [user_msg_id])[-_RECENT_TURNS:]
+
+    # Layer 3: prompt uses the stored summary; refreshing it only matters for
+    # future turns, so it runs in the background alongside the main LLM call.
+    summary = summary_row.get("summary") or ""
+    if conversation_id not in _SUMMARIZING:
+        _SUMMARIZING.add(conversation_id)
+        _spawn_background(
+            _maybe_summarize(conversation_id, user_uid, total, summary_row, recent_ids)
+        ).add_done_callback(lambda _t: _SUMMARIZING.discard(conversation_id))
 
     # Build prompt with 3-layer memory architecture
     prompt, breakdown = _build_prompt(summary, memories, cross_chat_profile, history, hrv_context, rag_hits, user_message,
@@ -468,7 +548,7 @@ async def chat_once(
 
     if settings.debug_prompt_context:
         try:
-            prompt_json = json.dumps(prompt, ensure_ascii=False, default=str)
+            prompt_json = orjson.dumps(prompt, default=str).decode()
             if len(prompt_json) > settings.debug_prompt_max_chars:
                 prompt_json = prompt_json[: settings.debug_prompt_max_chars] + "\n...[truncated]"
             logger.info(
@@ -481,30 +561,55 @@ async def chat_once(
         except Exception as exc:
             logger.warning("Prompt debug logging failed: %s", exc)
 
-    # Call OpenAI
-    reply = await asyncio.to_thread(call_gpt, prompt)
+    return {
+        "t0": t0,
+        "user_uid": user_uid,
+        "conversation_id": conversation_id,
+        "user_message": user_message,
+        "hrv_range": hrv_range,
+        "rag_k": rag_k,
+        "prompt": prompt,
+        "breakdown": breakdown,
+        "hrv_context": hrv_context,
+        "rag_hits": rag_hits,
+        "cross_chat_profile": cross_chat_profile,
+    }
 
-    # Persist assistant turn
-    insert_message(
-        user_uid,
-        conversation_id,
-        role="assistant",
-        content=reply,
-        model=None,
-        metadata={"hrv_range": hrv_range, "rag_k": rag_k},
+
+def _persist_reply(turn: Dict[str, Any], reply: str, **metadata: Any) -> None:
+    """Persist the assistant turn in background (response does not wait for the commit)."""
+    _spawn_background(
+        asyncio.to_thread(
+            insert_message,
+            turn["user_uid"],
+            turn["conversation_id"],
+            role="assistant",
+            content=reply,
+            model=None,
+            metadata={"hrv_range": turn["hrv_range"], "rag_k": turn["rag_k"], **metadata},
+        )
     )
 
+
+def _finish_turn(turn: Dict[str, Any], reply: str) -> Dict[str, Any]:
+    """Schedule post-reply persistence / memory work and build the turn result."""
+    user_uid = turn["user_uid"]
+    user_message = turn["user_message"]
+
+    _persist_reply(turn, reply)
+
     # Layer 2: extract and store memories in background (no latency hit)
-    asyncio.create_task(extract_and_store_memories(user_uid, user_message, reply))
+    _spawn_background(extract_and_store_memories(user_uid, user_message, reply))
 
     # Cross-chat profile update in background
     if settings.cross_chat_memory_enabled:
-        asyncio.create_task(
-            _update_cross_chat_profile_bg(user_uid, user_message, reply, cross_chat_profile)
+        _spawn_background(
+            _update_cross_chat_profile_bg(user_uid, user_message, reply, turn["cross_chat_profile"])
         )
 
-    latency_ms = int((time.time() - t0) * 1000)
-    used_context = bool(hrv_context) or bool(rag_hits)
+    latency_ms = int((time.time() - turn["t0"]) * 1000)
+    used_context = bool(turn["hrv_context"]) or bool(turn["rag_hits"])
+    breakdown = turn["breakdown"]
 
     logger.info(
         "chat tokens — total=%d system=%d summary=%d memory=%d history=%d hrv=%d rag=%d latency_ms=%d",
@@ -521,12 +626,66 @@ async def chat_once(
     return {
         "reply": reply,
         "used_context": used_context,
-        "hrv_range": hrv_range,
-        "rag_k": len(rag_hits),
+        "hrv_range": turn["hrv_range"],
+        "rag_k": len(turn["rag_hits"]),
         "latency_ms": latency_ms,
     }
 
 
+async def chat_once(
+    user_uid: str,
+    conversation_id: str,
+    user_message: str,
+    hrv_range: str,
+    rag_k: int = 3,
+) -> Dict[str, Any]:
+    turn = await _prepare_turn(user_uid, conversation_id, user_message, hrv_range, rag_k)
+
+    # Call OpenAI
+    reply = await call_gpt_async(turn["prompt"])
+
+    return _finish_turn(turn, reply)
+
+
+async def start_chat_stream(
+    user_uid: str,
+    conversation_id: str,
+    user_message: str,
+    hrv_range: str,
+    rag_k: int = 3,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of chat_once.
+
+    Context gathering and prompt building happen before this returns, so
+    LookupError etc. surface to the caller before any bytes are sent. The
+    returned iterator yields {"delta": str} events followed by a single
+    {"done": True, **result} event carrying the same fields as chat_once.
+    """
+    turn = await _prepare_turn(user_uid, conversation_id, user_message, hrv_range, rag_k)
+
+    async def _events() -> AsyncIterator[Dict[str, Any]]:
+        parts: List[str] = []
+        finished = False
+        try:
+            async for delta in call_gpt_stream(turn["prompt"]):
+                parts.append(delta)
+                yield {"delta": delta}
+            finished = True
+        finally:
+            # Client went away (or the stream failed) mid-reply: keep what was
+            # already delivered so the stored history matches what the user saw.
+            partial = "".join(parts).strip()
+            if not finished and partial:
+                _persist_reply(turn, partial, partial=True)
+        reply = "".join(parts).strip()
+        if not reply:
+            logger.warning("GPT stream returned empty — conversation_id=%s", conversation_id)
+        yield {"done": True, **_finish_turn(turn, reply)}
+
+    return _events()
+
+
 async def generate_practice_script(
     user_uid: str,
     conversation_id: str,
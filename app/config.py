@@ -11,14 +11,20 @@ load_dotenv()
 @dataclass(frozen=True)
 class Settings:
     database_url: str = os.getenv("DATABASE_URL", "")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
     hrv_api_url: str = os.getenv("HRV_API_URL", "http://127.0.0.1:8002")
     hrv_api_key: str = os.getenv("HRV_API_KEY", "")
     qdrant_url: str = os.getenv("QDRANT_URL", "")
     qdrant_api_key: str = os.getenv("QDRANT_API_KEY", "")
     qdrant_top_k: int = int(os.getenv("QDRANT_TOP_K", "10"))
+    qdrant_prefer_grpc: bool = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("true", "1", "yes")
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-5-nano")
     openai_embeddings_model: str = os.getenv("OPENAI_EMBEDDINGS_MODEL", "text-embedding-3-small")
+    # Read timeout (seconds) for non-streamed completions; reasoning models with large
+    # completion caps (meditation scripts) can take minutes
+    openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", "600"))
     langsmith_tracing: bool = os.getenv("LANGSMITH_TRACING", "false").lower() in ("true", "1", "yes")
     langsmith_api_key: str = os.getenv("LANGSMITH_API_KEY", "")
     lang_smith_key_legacy: str = os.getenv("LANG_SMITH_KEY", "")
@@ -48,9 +54,17 @@ class Settings:
 
     # ── Hyperparameters (tunable, non-env) ──────────────────────────
 
+    # Database pool
+    db_pool_timeout: float = 5.0
+    db_pool_recycle: int = 1800
+    # psycopg server-side prepare after N executions per connection (None disables;
+    # required behind a transaction-pooling PgBouncer)
+    db_prepare_threshold: int | None = 1
+
     # Rate limiting
     rate_limit_capacity: float = 20.0
     rate_limit_refill_per_sec: float = 20.0 / 60.0
+    rate_limit_max_buckets: int = 100_000
 
     # Token budget
     max_context_tokens: int = 100_000
@@ -62,10 +76,14 @@ class Settings:
     chat_rag_chunk_tokens: int = 300
     chat_rag_max_chunks: int = 20
     chat_summary_max_tokens: int = 800
+    # Completion cap for summarization calls; includes reasoning tokens on gpt-5 models
+    chat_summary_completion_tokens: int = 4096
 
     # HRV client
     hrv_max_daily_rows: int = 14
     hrv_client_timeout: float = 2.0
+    hrv_cache_ttl: float = 60.0
+    hrv_cache_max_entries: int = 1024
 
     # HRV Apple
     hrv_daily_window: int = 14
@@ -88,6 +106,18 @@ class Settings:
     meditation_music_length_ms: int = 60000
     meditation_max_stored: int = 25
 
+    # OpenAI HTTP clients (HTTP/2; the SDK's keep-alive pool is already large)
+    openai_connect_timeout: float = 5.0
+    # Streamed chat: max wait between chunks, not for the whole reply
+    openai_stream_timeout: float = 120.0
+
+    # HRV API client (shared keep-alive pool; on the chat critical path)
+    hrv_client_connect_timeout: float = 1.0
+    hrv_client_max_keepalive: int = 32
+
+    # Qdrant client (seconds per request; fail fast on the chat path)
+    qdrant_timeout: int = 5
+
     # RAG service
     rag_collection: str = "documents1"
     rag_max_passage_chars: int = 600
@@ -102,7 +132,19 @@ class Settings:
     @property
     def database_url_psycopg(self) -> str:
         """Normalize SQLAlchemy-style URLs for direct psycopg connections."""
-        return self.database_url.replace("+psycopg2", "")
+        return self.database_url.replace("+psycopg2", "").replace("+psycopg", "")
+
+    @property
+    def database_url_sqlalchemy(self) -> str:
+        """Point SQLAlchemy at the psycopg 3 driver (server-side prepared statements)."""
+        url = self.database_url_psycopg
+        if url.startswith("postgresql://"):
+            return "postgresql+psycopg://" + url[len("postgresql://"):]
+        return url
 
 
 settings = Settings()
+
+# Plain module bindings for values read on every request (skip attribute lookup)
+AUTH_REQUIRED = bool(settings.app_token)
+APP_TOKEN_BYTES = settings.app_token.encode()
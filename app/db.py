@@ -13,5 +13,16 @@ def get_engine() -> Engine:
     if _engine is None:
         if not settings.database_url:
             raise RuntimeError("DATABASE_URL is not configured")
-        _engine = create_engine(settings.database_url, pool_pre_ping=True)
+        _engine = create_engine(
+            settings.database_url_sqlalchemy,
+            pool_pre_ping=True,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,  # fail fast instead of queueing
+            pool_recycle=settings.db_pool_recycle,
+            # LIFO keeps a small set of connections hot, so their server-side
+            # prepared plans get reused and surplus idle ones age out via recycle
+            pool_use_lifo=True,
+            connect_args={"prepare_threshold": settings.db_prepare_threshold},
+        )
     return _engine
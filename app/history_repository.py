@@ -1,59 +1,171 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import text
+import orjson
+from psycopg.types.json import Jsonb
+from sqlalchemy import RowMapping, text
 
 from app.db import get_engine
 
-
-def assert_conversation_owner(user_uid: str, conversation_id: str) -> None:
-    """Raise LookupError if conversation doesn't belong to user."""
-    eng = get_engine()
-    with eng.begin() as conn:
-        row = conn.execute(
-            text("SELECT 1 FROM conversations WHERE id = :cid AND user_uid = :uid"),
-            {"cid": conversation_id, "uid": user_uid},
-        ).fetchone()
-    if row is None:
-        raise LookupError("conversation_not_found")
+# Statements are built once at import; SQLAlchemy's compiled cache is keyed on
+# these objects, so each one is parsed and compiled once per process.
+
+_SQL_CREATE_CONVERSATION = text(
+    """
+    INSERT INTO conversations (user_uid, title)
+    VALUES (:uid, :title)
+    RETURNING id::text AS conversation_id, created_at::text AS created_at
+    """
+)
+
+_SQL_LIST_CONVERSATIONS = text(
+    """
+    SELECT id::text AS conversation_id,
+           title,
+           updated_at::text AS updated_at
+    FROM conversations
+    WHERE user_uid = :uid AND is_archived = FALSE
+    ORDER BY updated_at DESC
+    LIMIT :lim
+    """
+)
+
+# History read checks ownership in the same statement: no row means the
+# conversation is not the user's; a single all-NULL row means it has no messages.
+# The newest :lim messages (optionally before :bid) come back oldest-first.
+_SQL_HISTORY = text(
+    """
+    SELECT m.id, m.role, m.content, m.created_at::text AS created_at
+    FROM conversations c
+    LEFT JOIN LATERAL (
+        SELECT id, role, content, created_at
+        FROM chat_messages
+        WHERE conversation_id = c.id AND user_uid = c.user_uid
+          AND (CAST(:bid AS BIGINT) IS NULL OR id < :bid)
+        ORDER BY id DESC
+        LIMIT :lim
+    ) m ON TRUE
+    WHERE c.id = :cid AND c.user_uid = :uid
+    ORDER BY m.id ASC
+    """
+)
+
+# Chat-turn variant: newest :lim messages plus the conversation's total message
+# count (counted once, repeated on every row), so the summarization check needs no
+# extra query.
+_SQL_HISTORY_WITH_TOTAL = text(
+    """
+    SELECT m.id, m.role, m.content, m.created_at::text AS created_at, t.total
+    FROM conversations c
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS total FROM chat_messages WHERE conversation_id = c.id
+    ) t
+    LEFT JOIN LATERAL (
+        SELECT id, role, content, created_at
+        FROM chat_messages
+        WHERE conversation_id = c.id AND user_uid = c.user_uid
+        ORDER BY id DESC
+        LIMIT :lim
+    ) m ON TRUE
+    WHERE c.id = :cid AND c.user_uid = :uid
+    ORDER BY m.id ASC
+    """
+)
+
+# Ownership check, insert and conversation touch in one round-trip; no row
+# back means the conversation is not the user's.
+_SQL_INSERT_MESSAGE = text(
+    """
+    WITH ins AS (
+        INSERT INTO chat_messages (conversation_id, user_uid, role, content, model, metadata)
+        SELECT c.id, c.user_uid, :role, :content, :model, CAST(:meta AS jsonb)
+        FROM conversations c
+        WHERE c.id = :cid AND c.user_uid = :uid
+        RETURNING id
+    ), touch AS (
+        UPDATE conversations SET updated_at = now()
+        WHERE id = :cid AND user_uid = :uid AND EXISTS (SELECT 1 FROM ins)
+    )
+    SELECT id FROM ins
+    """
+)
+
+_SQL_GET_SUMMARY = text(
+    """
+    SELECT summary, summarized_through_message_id
+    FROM conversation_summaries
+    WHERE conversation_id = :cid AND user_uid = :uid
+    """
+)
+
+_SQL_CREATE_SUMMARY = text(
+    """
+    INSERT INTO conversation_summaries (conversation_id, user_uid)
+    SELECT :cid, :uid
+    WHERE EXISTS (
+        SELECT 1 FROM conversations WHERE id = :cid AND user_uid = :uid
+    )
+    ON CONFLICT (conversation_id) DO NOTHING
+    """
+)
+
+_SQL_UPDATE_SUMMARY = text(
+    """
+    UPDATE conversation_summaries
+    SET summary = :s,
+        summarized_through_message_id = :mid,
+        updated_at = now()
+    WHERE conversation_id = :cid AND user_uid = :uid
+    """
+)
+
+_SQL_SUMMARIZATION_AFTER = text(
+    """
+    SELECT id, role, content
+    FROM chat_messages
+    WHERE conversation_id = :cid AND user_uid = :uid AND id > :aid AND id < :bid
+    ORDER BY id ASC
+    """
+)
+
+_SQL_SUMMARIZATION_ALL = text(
+    """
+    SELECT id, role, content
+    FROM chat_messages
+    WHERE conversation_id = :cid AND user_uid = :uid AND id < :bid
+    ORDER BY id ASC
+    """
+)
+
+_SQL_GET_PROFILE = text("SELECT profile FROM user_cross_chat_profiles WHERE user_uid = :uid")
+
+_SQL_UPSERT_PROFILE = text(
+    """
+    INSERT INTO user_cross_chat_profiles (user_uid, profile)
+    VALUES (:uid, :profile)
+    ON CONFLICT (user_uid) DO UPDATE SET profile = :profile, updated_at = now()
+    """
+)
 
 
 def create_conversation(user_uid: str, title: Optional[str]) -> Dict[str, Any]:
     eng = get_engine()
     with eng.begin() as conn:
         row = conn.execute(
-            text(
-                """
-                INSERT INTO conversations (user_uid, title)
-                VALUES (:uid, :title)
-                RETURNING id::text AS conversation_id, created_at::text AS created_at
-                """
-            ),
+            _SQL_CREATE_CONVERSATION,
             {"uid": user_uid, "title": title},
         ).fetchone()
     return {"conversation_id": row.conversation_id, "created_at": row.created_at}
 
 
-def list_conversations(user_uid: str, limit: int = 50) -> List[Dict[str, Any]]:
+def list_conversations(user_uid: str, limit: int = 50) -> Sequence[RowMapping]:
     eng = get_engine()
     with eng.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT id::text AS conversation_id,
-                       title,
-                       updated_at::text AS updated_at
-                FROM conversations
-                WHERE user_uid = :uid AND is_archived = FALSE
-                ORDER BY updated_at DESC
-                LIMIT :lim
-                """
-            ),
+        return conn.execute(
+            _SQL_LIST_CONVERSATIONS,
             {"uid": user_uid, "lim": limit},
-        ).fetchall()
-    return [dict(r._mapping) for r in rows]
+        ).mappings().all()
 
 
 def fetch_history(
@@ -61,38 +173,39 @@ def fetch_history(
     conversation_id: str,
     limit: int = 50,
     before_id: Optional[int] = None,
-) -> List[Dict[str, Any]]:
-    assert_conversation_owner(user_uid, conversation_id)
+) -> List[RowMapping]:
     eng = get_engine()
     with eng.begin() as conn:
-        if before_id is not None:
-            rows = conn.execute(
-                text(
-                    """
-                    SELECT id, role, content, created_at::text AS created_at
-                    FROM chat_messages
-                    WHERE conversation_id = :cid AND user_uid = :uid AND id < :bid
-                    ORDER BY created_at DESC
-                    LIMIT :lim
-                    """
-                ),
-                {"cid": conversation_id, "uid": user_uid, "bid": before_id, "lim": limit},
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                text(
-                    """
-                    SELECT id, role, content, created_at::text AS created_at
-                    FROM chat_messages
-                    WHERE conversation_id = :cid AND user_uid = :uid
-                    ORDER BY created_at DESC
-                    LIMIT :lim
-                    """
-                ),
-                {"cid": conversation_id, "uid": user_uid, "lim": limit},
-            ).fetchall()
-    items = [dict(r._mapping) for r in rows]
-    return list(reversed(items))  # return ascending for display / prompting
+        rows = conn.execute(
+            _SQL_HISTORY,
+            {"cid": conversation_id, "uid": user_uid, "bid": before_id, "lim": limit},
+        ).mappings().all()
+    if not rows:
+        raise LookupError("conversation_not_found")
+    # Ascending for display / prompting
+    return [r for r in rows if r["id"] is not None]
+
+
+def fetch_history_with_total(
+    user_uid: str,
+    conversation_id: str,
+    limit: int = 50,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """fetch_history (latest page) plus the total message count, in one query."""
+    eng = get_engine()
+    with eng.begin() as conn:
+        rows = conn.execute(
+            _SQL_HISTORY_WITH_TOTAL,
+            {"cid": conversation_id, "uid": user_uid, "lim": limit},
+        ).fetchall()
+    if not rows:
+        raise LookupError("conversation_not_found")
+    items = [
+        {"id": r.id, "role": r.role, "content": r.content, "created_at": r.created_at}
+        for r in rows
+        if r.id is not None
+    ]
+    return items, int(rows[0].total)
 
 
 def insert_message(
@@ -102,18 +215,14 @@ def insert_message(
     content: str,
     model: Optional[str] = None,
     metadata: Optional[dict] = None,
-) -> None:
-    assert_conversation_owner(user_uid, conversation_id)
-    meta_json = json.dumps(metadata) if metadata else None
+) -> int:
+    """Insert a chat message and return its id."""
+    # Bound as jsonb by psycopg, serialized with orjson
+    meta_json = Jsonb(metadata, dumps=orjson.dumps) if metadata else None
     eng = get_engine()
     with eng.begin() as conn:
-        conn.execute(
-            text(
-                """
-                INSERT INTO chat_messages (conversation_id, user_uid, role, content, model, metadata)
-                VALUES (:cid, :uid, :role, :content, :model, CAST(:meta AS jsonb))
-                """
-            ),
+        row = conn.execute(
+            _SQL_INSERT_MESSAGE,
             {
                 "cid": conversation_id,
                 "uid": user_uid,
@@ -122,47 +231,22 @@ def insert_message(
                 "model": model,
                 "meta": meta_json,
             },
-        )
-        conn.execute(
-            text(
-                "UPDATE conversations SET updated_at = now() WHERE id = :cid AND user_uid = :uid"
-            ),
-            {"cid": conversation_id, "uid": user_uid},
-        )
-
-
-def count_messages(conversation_id: str) -> int:
-    eng = get_engine()
-    with eng.begin() as conn:
-        row = conn.execute(
-            text("SELECT COUNT(*) AS cnt FROM chat_messages WHERE conversation_id = :cid"),
-            {"cid": conversation_id},
         ).fetchone()
-    return int(row.cnt)
+    if row is None:
+        raise LookupError("conversation_not_found")
+    return int(row.id)
 
 
 def get_or_create_summary(conversation_id: str, user_uid: str) -> Dict[str, Any]:
     eng = get_engine()
     with eng.begin() as conn:
         row = conn.execute(
-            text(
-                """
-                SELECT summary, summarized_through_message_id
-                FROM conversation_summaries
-                WHERE conversation_id = :cid
-                """
-            ),
-            {"cid": conversation_id},
+            _SQL_GET_SUMMARY,
+            {"cid": conversation_id, "uid": user_uid},
         ).fetchone()
         if row is None:
             conn.execute(
-                text(
-                    """
-                    INSERT INTO conversation_summaries (conversation_id, user_uid)
-                    VALUES (:cid, :uid)
-                    ON CONFLICT (conversation_id) DO NOTHING
-                    """
-                ),
+                _SQL_CREATE_SUMMARY,
                 {"cid": conversation_id, "uid": user_uid},
             )
             return {"summary": "", "summarized_through_message_id": None}
@@ -171,58 +255,38 @@ def get_or_create_summary(conversation_id: str, user_uid: str) -> Dict[str, Any]
 
 def update_summary(
     conversation_id: str,
+    user_uid: str,
     summarized_through_id: int,
     summary_text: str,
 ) -> None:
     eng = get_engine()
     with eng.begin() as conn:
         conn.execute(
-            text(
-                """
-                UPDATE conversation_summaries
-                SET summary = :s,
-                    summarized_through_message_id = :mid,
-                    updated_at = now()
-                WHERE conversation_id = :cid
-                """
-            ),
-            {"s": summary_text, "mid": summarized_through_id, "cid": conversation_id},
+            _SQL_UPDATE_SUMMARY,
+            {"s": summary_text, "mid": summarized_through_id, "cid": conversation_id, "uid": user_uid},
         )
 
 
 def fetch_messages_for_summarization(
     conversation_id: str,
+    user_uid: str,
     after_id: Optional[int],
     before_id: int,
-) -> List[Dict[str, Any]]:
+) -> Sequence[RowMapping]:
     """Fetch messages older than before_id and newer than after_id for summarization."""
     eng = get_engine()
     with eng.begin() as conn:
         if after_id is not None:
             rows = conn.execute(
-                text(
-                    """
-                    SELECT id, role, content
-                    FROM chat_messages
-                    WHERE conversation_id = :cid AND id > :aid AND id < :bid
-                    ORDER BY id ASC
-                    """
-                ),
-                {"cid": conversation_id, "aid": after_id, "bid": before_id},
-            ).fetchall()
+                _SQL_SUMMARIZATION_AFTER,
+                {"cid": conversation_id, "uid": user_uid, "aid": after_id, "bid": before_id},
+            ).mappings().all()
         else:
             rows = conn.execute(
-                text(
-                    """
-                    SELECT id, role, content
-                    FROM chat_messages
-                    WHERE conversation_id = :cid AND id < :bid
-                    ORDER BY id ASC
-                    """
-                ),
-                {"cid": conversation_id, "bid": before_id},
-            ).fetchall()
-    return [dict(r._mapping) for r in rows]
+                _SQL_SUMMARIZATION_ALL,
+                {"cid": conversation_id, "uid": user_uid, "bid": before_id},
+            ).mappings().all()
+    return rows
 
 
 def get_cross_chat_profile(user_uid: str) -> str:
@@ -230,7 +294,7 @@ def get_cross_chat_profile(user_uid: str) -> str:
     eng = get_engine()
     with eng.begin() as conn:
         row = conn.execute(
-            text("SELECT profile FROM user_cross_chat_profiles WHERE user_uid = :uid"),
+            _SQL_GET_PROFILE,
             {"uid": user_uid},
         ).fetchone()
     return row.profile if row else ""
@@ -241,36 +305,11 @@ def upsert_cross_chat_profile(user_uid: str, profile: str) -> None:
     eng = get_engine()
     with eng.begin() as conn:
         conn.execute(
-            text(
-                """
-                INSERT INTO user_cross_chat_profiles (user_uid, profile)
-                VALUES (:uid, :profile)
-                ON CONFLICT (user_uid) DO UPDATE SET profile = :profile, updated_at = now()
-                """
-            ),
+            _SQL_UPSERT_PROFILE,
             {"uid": user_uid, "profile": profile},
         )
 
 
-def fetch_recent_message_ids(conversation_id: str, n: int = 20) -> List[int]:
-    """Return the IDs of the most recent N messages (ascending)."""
-    eng = get_engine()
-    with eng.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT id FROM chat_messages
-                WHERE conversation_id = :cid
-                ORDER BY id DESC
-                LIMIT :n
-                """
-            ),
-            {"cid": conversation_id, "n": n},
-        ).fetchall()
-    ids = [r.id for r in rows]
-    return list(reversed(ids))
-
-
 # ── Audio Narrations ──────────────────────────────────────────────
 
 
@@ -286,8 +325,6 @@ def insert_audio_narration(
     metadata: dict | None = None,
 ) -> Dict:
     """Insert an audio narration record and return {id, created_at}."""
-    import json
-
     eng = get_engine()
     with eng.begin() as conn:
         row = conn.execute(
@@ -311,13 +348,13 @@ def insert_audio_narration(
                 "fpath": file_path,
                 "dur": duration_seconds,
                 "title": title,
-                "meta": json.dumps(metadata) if metadata else None,
+                "meta": Jsonb(metadata, dumps=orjson.dumps) if metadata else None,
             },
         ).fetchone()
     return {"id": str(row.id), "created_at": str(row.created_at)}
 
 
-def list_audio_narrations(user_uid: str, limit: int = 25) -> List[Dict]:
+def list_audio_narrations(user_uid: str, limit: int = 25) -> Sequence[RowMapping]:
     """List audio narrations for a user, ordered by newest first."""
     eng = get_engine()
     with eng.begin() as conn:
@@ -334,8 +371,8 @@ def list_audio_narrations(user_uid: str, limit: int = 25) -> List[Dict]:
                 """
             ),
             {"uid": user_uid, "lim": limit},
-        ).fetchall()
-    return [dict(r._mapping) for r in rows]
+        ).mappings().all()
+    return rows
 
 
 def delete_audio_narration(narration_id: str, user_uid: str) -> str | None:
@@ -91,12 +91,12 @@ def _daily_from_apple_sdnn(conn: Any, user_uid: str) -> List[Dict[str, Any]]:
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = 'hrv'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC')
             ORDER BY day ASC
-        """.replace(":days", str(_DAILY_WINDOW))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": _DAILY_WINDOW},
     ).fetchall()
 
     daily = []
@@ -118,12 +118,12 @@ def _daily_from_apple_sdnn_range(conn: Any, user_uid: str, days: int) -> List[Di
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = 'hrv'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC')
             ORDER BY day ASC
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchall()
 
     return [
@@ -141,11 +141,11 @@ def _daily_heart_rate_range(conn: Any, user_uid: str, days: int) -> Dict[str, fl
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = 'heart_rate'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC')
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchall()
     return {str(row.day): float(row.mean_hr) for row in rows}
 
@@ -158,11 +158,11 @@ def _daily_heart_rate(conn: Any, user_uid: str) -> Dict[str, float]:
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = 'heart_rate'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC')
-        """.replace(":days", str(_DAILY_WINDOW))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": _DAILY_WINDOW},
     ).fetchall()
     return {str(row.day): float(row.mean_hr) for row in rows}
 
@@ -177,11 +177,11 @@ def _sample_timeseries(
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = :sample_type
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             ORDER BY start_time ASC
-        """.replace(":days", str(days))),
-        {"uid": user_uid, "sample_type": sample_type},
+        """),
+        {"uid": user_uid, "sample_type": sample_type, "days": days},
     ).fetchall()
 
     return [
@@ -202,13 +202,13 @@ def _daily_hourly_timeseries(
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = :sample_type
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC'),
                      FLOOR(EXTRACT(HOUR FROM start_time AT TIME ZONE 'UTC') / 2) * 2
             ORDER BY day ASC, hour_bucket ASC
-        """.replace(":days", str(days))),
-        {"uid": user_uid, "sample_type": sample_type},
+        """),
+        {"uid": user_uid, "sample_type": sample_type, "days": days},
     ).fetchall()
 
     result = []
@@ -255,10 +255,10 @@ def _agg_hrv(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any]]:
             SELECT AVG(value) AS mean_sdnn, COUNT(*) AS cnt
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'hrv'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt:
@@ -279,9 +279,9 @@ def _agg_hrv_sdnn(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any
                    COUNT(*) FILTER (WHERE value IS NOT NULL) AS value_count
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'hrv_sdnn'
-              AND start_time >= NOW() - INTERVAL ':days days'
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+              AND start_time >= NOW() - make_interval(days => :days)
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.session_count:
@@ -307,10 +307,10 @@ def _agg_heart_rate(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, A
                    COUNT(*) AS cnt
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'heart_rate'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt:
@@ -329,10 +329,10 @@ def _agg_sleep(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any]]:
             SELECT AVG(value) AS mean_hours, COUNT(*) AS cnt
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'sleep'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt:
@@ -353,12 +353,12 @@ def _agg_steps(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any]]:
                        SUM(value) AS daily_total
                 FROM health_samples
                 WHERE user_id = :uid AND sample_type = 'steps'
-                  AND start_time >= NOW() - INTERVAL ':days days'
+                  AND start_time >= NOW() - make_interval(days => :days)
                   AND value IS NOT NULL
                 GROUP BY DATE(start_time AT TIME ZONE 'UTC')
             ) AS daily
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt:
@@ -464,15 +464,15 @@ def _half_split_trend(conn: Any, user_uid: str, sample_type: str, days: int) ->
     row = conn.execute(
         text("""
             SELECT
-                AVG(value) FILTER (WHERE start_time >= NOW() - INTERVAL ':half days') AS recent,
-                AVG(value) FILTER (WHERE start_time < NOW() - INTERVAL ':half days'
-                                     AND start_time >= NOW() - INTERVAL ':days days') AS older
+                AVG(value) FILTER (WHERE start_time >= NOW() - make_interval(days => :half)) AS recent,
+                AVG(value) FILTER (WHERE start_time < NOW() - make_interval(days => :half)
+                                     AND start_time >= NOW() - make_interval(days => :days)) AS older
             FROM health_samples
             WHERE user_id = :uid AND sample_type = :stype
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":half", str(half)).replace(":days", str(days))),
-        {"uid": user_uid, "stype": sample_type},
+        """),
+        {"uid": user_uid, "stype": sample_type, "days": days, "half": half},
     ).fetchone()
 
     if not row or row.recent is None or row.older is None or row.older == 0:
@@ -1,24 +1,61 @@
 from __future__ import annotations
 
 import logging
+import operator
 from typing import Any, Dict, List
 
 import httpx
+import orjson
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 _MAX_DAILY_ROWS = 14
-_DAILY_FIELDS = {"date", "rmssd", "sdnn", "mean_hr", "lf_hf_ratio"}
+_DAILY_FIELDS = ("date", "rmssd", "sdnn", "mean_hr", "lf_hf_ratio")
+_get_daily_fields = operator.itemgetter(*_DAILY_FIELDS)
+
+# Alternative summary_metrics keys for the same aggregate, in preference order
+_HR_MEAN_KEYS = ("mean_hr", "hr_mean", "mean_heart_rate")
+_SLEEP_MEAN_KEYS = ("mean_sleep_hours", "avg_sleep_hours", "sleep_mean")
+_STEPS_MEAN_KEYS = ("mean_steps", "avg_steps", "steps_mean")
+_MISSING = object()
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Shared client so HRV fetches reuse keep-alive connections (HTTP/2 when offered)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.hrv_client_timeout, connect=settings.hrv_client_connect_timeout
+            ),
+            limits=httpx.Limits(max_keepalive_connections=settings.hrv_client_max_keepalive),
+            http2=True,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 def _shape_daily_matrix(time_series: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Return last 14 rows keeping only the relevant daily fields."""
     rows = time_series[-_MAX_DAILY_ROWS:]
-    out = []
+    out: List[Dict[str, Any]] = []
     for row in rows:
-        entry: Dict[str, Any] = {f: row[f] for f in _DAILY_FIELDS if f in row}
+        try:
+            entry = dict(zip(_DAILY_FIELDS, _get_daily_fields(row)))
+        except KeyError:
+            # Partial row: keep whichever fields are present
+            entry = {f: row[f] for f in _DAILY_FIELDS if f in row}
         out.append(entry)
     return out
 
@@ -39,28 +76,25 @@ def _shape_90d_aggregates(data: Dict[str, Any]) -> Dict[str, Any]:
         hrv_90d["trend"] = trend
 
     hr_90d: Dict[str, Any] = {}
-    for key in ("mean_hr", "hr_mean", "mean_heart_rate"):
-        if key in sm:
-            hr_90d["mean"] = sm[key]
-            break
+    hr_mean = next((sm[k] for k in _HR_MEAN_KEYS if k in sm), _MISSING)
+    if hr_mean is not _MISSING:
+        hr_90d["mean"] = hr_mean
     if "hr_p10" in sm:
         hr_90d["p10"] = sm["hr_p10"]
     if "hr_p90" in sm:
         hr_90d["p90"] = sm["hr_p90"]
 
     sleep_90d: Dict[str, Any] = {}
-    for key in ("mean_sleep_hours", "avg_sleep_hours", "sleep_mean"):
-        if key in sm:
-            sleep_90d["mean_hours"] = sm[key]
-            break
+    sleep_mean = next((sm[k] for k in _SLEEP_MEAN_KEYS if k in sm), _MISSING)
+    if sleep_mean is not _MISSING:
+        sleep_90d["mean_hours"] = sleep_mean
     if "sleep_trend" in patterns:
         sleep_90d["trend"] = patterns["sleep_trend"]
 
     steps_90d: Dict[str, Any] = {}
-    for key in ("mean_steps", "avg_steps", "steps_mean"):
-        if key in sm:
-            steps_90d["mean"] = sm[key]
-            break
+    steps_mean = next((sm[k] for k in _STEPS_MEAN_KEYS if k in sm), _MISSING)
+    if steps_mean is not _MISSING:
+        steps_90d["mean"] = steps_mean
     if "steps_trend" in patterns:
         steps_90d["trend"] = patterns["steps_trend"]
 
@@ -89,16 +123,14 @@ async def fetch_hrv_context(user_uid: str, hrv_range: str) -> Dict[str, Any]:
     url = f"{settings.hrv_api_url}/v1/hrv/analysis"
     params = {"user_id": user_uid, "range": hrv_range}
     headers = {"x-api-key": settings.hrv_api_key}
-    timeout = httpx.Timeout(2.0, connect=1.0)
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.get(url, params=params, headers=headers)
+        resp = await _get_client().get(url, params=params, headers=headers)
 
         if resp.status_code == 404:
             return {}
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception as exc:
         logger.warning("HRV fetch failed: %s", exc)
         return {}
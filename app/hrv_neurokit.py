@@ -224,12 +224,12 @@ def _daily_from_apple_sdnn(conn: Any, user_uid: str) -> List[Dict[str, Any]]:
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = 'hrv'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC')
             ORDER BY day ASC
-        """.replace(":days", str(_DAILY_WINDOW))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": _DAILY_WINDOW},
     ).fetchall()
 
     daily = []
@@ -268,10 +268,10 @@ def _daily_from_hrv_sdnn_payload(conn: Any, user_uid: str) -> List[Dict[str, Any
             WHERE user_id = :uid
               AND sample_type = 'hrv_sdnn'
               AND payload IS NOT NULL
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
             ORDER BY start_time ASC
-        """.replace(":days", str(_DAILY_WINDOW))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": _DAILY_WINDOW},
     ).fetchall()
 
     # Group by day, collect RR intervals
@@ -313,10 +313,10 @@ def _daily_from_heartbeat_series(conn: Any, user_uid: str) -> List[Dict[str, Any
             WHERE user_id = :uid
               AND sample_type = 'heartbeat_series'
               AND payload IS NOT NULL
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
             ORDER BY start_time ASC
-        """.replace(":days", str(_DAILY_WINDOW))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": _DAILY_WINDOW},
     ).fetchall()
 
     # Collect per-day: either RR intervals (for fresh compute) or pre-computed metrics
@@ -378,11 +378,11 @@ def _daily_heart_rate(conn: Any, user_uid: str) -> Dict[str, float]:
             FROM health_samples
             WHERE user_id = :uid
               AND sample_type = 'heart_rate'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
             GROUP BY DATE(start_time AT TIME ZONE 'UTC')
-        """.replace(":days", str(_DAILY_WINDOW))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": _DAILY_WINDOW},
     ).fetchall()
     return {str(r.day): float(r.mean_hr) for r in rows}
 
@@ -591,10 +591,10 @@ def _agg_hrv(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any]]:
             SELECT AVG(value) AS mean_sdnn, COUNT(*) AS cnt
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'hrv'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt or row.cnt == 0:
@@ -614,9 +614,9 @@ def _agg_hrv_sdnn(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any
                 COUNT(*) FILTER (WHERE value IS NOT NULL) AS value_count
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'hrv_sdnn'
-              AND start_time >= NOW() - INTERVAL ':days days'
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+              AND start_time >= NOW() - make_interval(days => :days)
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.session_count or row.session_count == 0:
@@ -642,10 +642,10 @@ def _agg_heart_rate(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, A
                    COUNT(*) AS cnt
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'heart_rate'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt or row.cnt == 0:
@@ -664,10 +664,10 @@ def _agg_sleep(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any]]:
             SELECT AVG(value) AS mean_hours, COUNT(*) AS cnt
             FROM health_samples
             WHERE user_id = :uid AND sample_type = 'sleep'
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt or row.cnt == 0:
@@ -687,12 +687,12 @@ def _agg_steps(conn: Any, user_uid: str, days: int) -> Optional[Dict[str, Any]]:
                        SUM(value) AS daily_total
                 FROM health_samples
                 WHERE user_id = :uid AND sample_type = 'steps'
-                  AND start_time >= NOW() - INTERVAL ':days days'
+                  AND start_time >= NOW() - make_interval(days => :days)
                   AND value IS NOT NULL
                 GROUP BY DATE(start_time AT TIME ZONE 'UTC')
             ) AS daily
-        """.replace(":days", str(days))),
-        {"uid": user_uid},
+        """),
+        {"uid": user_uid, "days": days},
     ).fetchone()
 
     if not row or not row.cnt or row.cnt == 0:
@@ -719,15 +719,15 @@ def _half_split_trend(
     row = conn.execute(
         text("""
             SELECT
-                AVG(value) FILTER (WHERE start_time >= NOW() - INTERVAL ':half days') AS recent,
-                AVG(value) FILTER (WHERE start_time < NOW() - INTERVAL ':half days'
-                                     AND start_time >= NOW() - INTERVAL ':days days') AS older
+                AVG(value) FILTER (WHERE start_time >= NOW() - make_interval(days => :half)) AS recent,
+                AVG(value) FILTER (WHERE start_time < NOW() - make_interval(days => :half)
+                                     AND start_time >= NOW() - make_interval(days => :days)) AS older
             FROM health_samples
             WHERE user_id = :uid AND sample_type = :stype
-              AND start_time >= NOW() - INTERVAL ':days days'
+              AND start_time >= NOW() - make_interval(days => :days)
               AND value IS NOT NULL
-        """.replace(":half", str(half)).replace(":days", str(days))),
-        {"uid": user_uid, "stype": sample_type},
+        """),
+        {"uid": user_uid, "stype": sample_type, "days": days, "half": half},
     ).fetchone()
 
     if not row or row.recent is None or row.older is None or row.older == 0:
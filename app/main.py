@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from app.calendar_sync import router as calendar_sync_router
 
 from app.auth_router import router as auth_router
 from app.chat_router import router as chat_router
+from app.hrv_client import close_client as close_hrv_client
 from app.ingest_router import router as ingest_router
 from app.meditation_router import router as meditation_router
 from app.mindfulness_router import router as mindfulness_router
@@ -14,7 +17,14 @@ from app.practice_router import router as practice_router
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
 
-app = FastAPI(title="NeuroHeart Chat API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await close_hrv_client()
+
+
+app = FastAPI(title="NeuroHeart Chat API", version="1.0.0", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -29,3 +39,11 @@ app.include_router(practice_router)
 app.include_router(meditation_router)
 app.include_router(mindfulness_router)
 app.include_router(calendar_sync_router)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop + httptools ship with uvicorn[standard]; pin them so a missing
+    # extra fails at startup instead of silently falling back to asyncio/h11
+    uvicorn.run(app, host="0.0.0.0", port=8003, loop="uvloop", http="httptools")
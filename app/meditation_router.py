@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import datetime
+import hmac
 import logging
 import os
 from typing import Optional
@@ -11,7 +13,7 @@ from typing import Optional
 from fastapi import APIRouter, Header, HTTPException, Query
 from fastapi.responses import FileResponse
 
-from app.config import settings
+from app.config import APP_TOKEN_BYTES, AUTH_REQUIRED, settings
 from app.history_repository import (
     delete_audio_narration,
     insert_audio_narration,
@@ -34,7 +36,7 @@ router = APIRouter(prefix="/v1/practice", tags=["meditation"])
 
 
 def _require_app_token(x_app_token: Optional[str]) -> None:
-    if settings.app_token and x_app_token != settings.app_token:
+    if AUTH_REQUIRED and not hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES):
         raise HTTPException(status_code=403, detail="forbidden")
 
 
@@ -71,7 +73,8 @@ async def generate_meditation_endpoint(
                 f"[MEDITATION_AUDIO:{result['audio_url']}:{title}]"
             )
             try:
-                insert_message(
+                await asyncio.to_thread(
+                    insert_message,
                     user_uid=req.user_uid,
                     conversation_id=req.conversation_id,
                     role="assistant",
@@ -118,7 +121,8 @@ async def upload_audio(
 
         title = req.title or f"Upload: {datetime.date.today().isoformat()}"
 
-        record = insert_audio_narration(
+        record = await asyncio.to_thread(
+            insert_audio_narration,
             user_uid=req.user_uid,
             conversation_id=req.conversation_id,
             session_id=req.session_id,
@@ -149,7 +153,7 @@ async def list_audio(
     """List user's audio narrations (max 25, newest first)."""
     _require_app_token(x_app_token)
 
-    rows = list_audio_narrations(user_uid, limit=25)
+    rows = await asyncio.to_thread(list_audio_narrations, user_uid, limit=25)
     narrations = []
     for r in rows:
         filename = os.path.basename(r["file_path"])
@@ -192,7 +196,7 @@ async def delete_audio(
     """Delete an audio narration and its file."""
     _require_app_token(x_app_token)
 
-    file_path = delete_audio_narration(narration_id, user_uid)
+    file_path = await asyncio.to_thread(delete_audio_narration, narration_id, user_uid)
     if file_path is None:
         raise HTTPException(status_code=404, detail="narration_not_found")
 
@@ -390,7 +390,8 @@ async def generate_meditation(
     # Step 4: Generate unique title via LLM
     title = await _generate_title(script, mood)
 
-    insert_audio_narration(
+    await asyncio.to_thread(
+        insert_audio_narration,
         user_uid=user_uid,
         conversation_id=conversation_id,
         session_id=session_id,
@@ -410,7 +411,7 @@ async def generate_meditation(
     )
 
     # Step 5: Enforce max 25 limit, clean up old files
-    deleted_paths = enforce_audio_limit(user_uid, max_count=25)
+    deleted_paths = await asyncio.to_thread(enforce_audio_limit, user_uid, max_count=25)
     for p in deleted_paths:
         try:
             if os.path.exists(p):
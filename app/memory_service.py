@@ -83,7 +83,12 @@ def _is_over_daily_budget() -> bool:
 def _get_qdrant() -> QdrantClient:
     global _qdrant
     if _qdrant is None:
-        _qdrant = QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+        _qdrant = QdrantClient(
+            url=settings.qdrant_url,
+            api_key=settings.qdrant_api_key,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            timeout=settings.qdrant_timeout,
+        )
     return _qdrant
 
 
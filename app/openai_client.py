@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI, Timeout
 
 from app.config import settings
 from app.llm_observability import traceable_call, wrap_openai_client
@@ -11,21 +11,42 @@ from app.llm_observability import traceable_call, wrap_openai_client
 logger = logging.getLogger(__name__)
 
 _client: OpenAI | None = None
+_async_client: AsyncOpenAI | None = None
+
+
+def _client_options() -> Dict[str, Any]:
+    return {
+        "api_key": settings.openai_api_key,
+        "timeout": Timeout(settings.openai_timeout, connect=settings.openai_connect_timeout),
+    }
 
 
 def get_openai() -> OpenAI:
     global _client
     if _client is None:
-        _client = wrap_openai_client(OpenAI(api_key=settings.openai_api_key))
+        # HTTP/2 lets concurrent turns multiplex over the pooled connections
+        _client = wrap_openai_client(
+            OpenAI(**_client_options(), http_client=DefaultHttpxClient(http2=True))
+        )
     return _client
 
 
-def call_gpt(messages: List[Dict[str, str]]) -> str:
+def get_async_openai() -> AsyncOpenAI:
+    global _async_client
+    if _async_client is None:
+        _async_client = wrap_openai_client(
+            AsyncOpenAI(**_client_options(), http_client=DefaultAsyncHttpxClient(http2=True))
+        )
+    return _async_client
+
+
+def call_gpt(messages: List[Dict[str, str]], max_completion_tokens: int | None = None) -> str:
     """
     Call OpenAI chat completion.
 
     Model is set via OPENAI_MODEL env var (default: gpt-4o-mini).
     User's intended model: gpt-5-nano — update OPENAI_MODEL in .env when available.
+    max_completion_tokens defaults to MAX_COMPLETION_TOKENS.
     """
     @traceable_call(run_name="chat_completion")
     def _call(messages: List[Dict[str, str]]) -> str:
@@ -33,7 +54,7 @@ def call_gpt(messages: List[Dict[str, str]]) -> str:
         resp = client.chat.completions.create(
             model=settings.openai_model,
             messages=messages,
-            max_completion_tokens=settings.max_completion_tokens,
+            max_completion_tokens=max_completion_tokens or settings.max_completion_tokens,
         )
         choice = resp.choices[0]
         content = (choice.message.content or "").strip()
@@ -48,13 +69,58 @@ def call_gpt(messages: List[Dict[str, str]]) -> str:
     return _call(messages)
 
 
-def call_gpt_mem0(messages: List[Dict[str, str]]) -> str:
+async def call_gpt_async(
+    messages: List[Dict[str, str]], max_completion_tokens: int | None = None
+) -> str:
+    """Async call_gpt: same request and empty-reply logging, without a worker thread."""
+    @traceable_call(run_name="chat_completion")
+    async def _call(messages: List[Dict[str, str]]) -> str:
+        client = get_async_openai()
+        resp = await client.chat.completions.create(
+            model=settings.openai_model,
+            messages=messages,
+            max_completion_tokens=max_completion_tokens or settings.max_completion_tokens,
+        )
+        choice = resp.choices[0]
+        content = (choice.message.content or "").strip()
+        if not content:
+            logger.warning(
+                "GPT returned empty — finish_reason=%s usage=%s",
+                choice.finish_reason,
+                resp.usage,
+            )
+        return content
+
+    return await _call(messages)
+
+
+async def call_gpt_stream(
+    messages: List[Dict[str, str]], max_completion_tokens: int | None = None
+) -> AsyncIterator[str]:
+    """Stream an OpenAI chat completion, yielding content deltas as they arrive."""
+    client = get_async_openai()
+    stream = await client.chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        max_completion_tokens=max_completion_tokens or settings.max_completion_tokens,
+        stream=True,
+        timeout=Timeout(settings.openai_stream_timeout, connect=settings.openai_connect_timeout),
+    )
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+def call_gpt_mem0(messages: List[Dict[str, str]], max_completion_tokens: int | None = None) -> str:
     """Call OpenAI with the mem0 model (for background tasks like summarization)."""
     client = get_openai()
     resp = client.chat.completions.create(
         model=settings.openai_model_mem0,
         messages=messages,
-        max_completion_tokens=settings.max_completion_tokens,
+        max_completion_tokens=max_completion_tokens or settings.max_completion_tokens,
     )
     choice = resp.choices[0]
     content = (choice.message.content or "").strip()
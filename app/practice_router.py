@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import datetime
+import hmac
 import logging
 from typing import Optional
 
 from fastapi import APIRouter, Header, HTTPException
 
 from app.chat_service import generate_practice_script
-from app.config import settings
+from app.config import APP_TOKEN_BYTES, AUTH_REQUIRED
 from app.schemas import PracticeRequest, PracticeResponse
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ router = APIRouter(prefix="/v1/practice", tags=["practice"])
 
 
 def _require_app_token(x_app_token: Optional[str]) -> None:
-    if settings.app_token and x_app_token != settings.app_token:
+    if AUTH_REQUIRED and not hmac.compare_digest((x_app_token or "").encode(), APP_TOKEN_BYTES):
         raise HTTPException(status_code=403, detail="forbidden")
 
 
@@ -3,8 +3,8 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
-from openai import OpenAI
-from qdrant_client import QdrantClient
+from openai import AsyncOpenAI
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models as qm
 
 from app.config import settings
@@ -15,31 +15,43 @@ from app.config import settings as _cfg
 _COLLECTION = _cfg.rag_collection
 _MAX_PASSAGE_CHARS = _cfg.rag_max_passage_chars
 
-_qdrant: QdrantClient | None = None
-_openai: OpenAI | None = None
+# Static parts of the retrieval filter, built once; only the user_uid match varies
+_KNOWLEDGE_CLAUSES = (
+    qm.IsEmptyCondition(is_empty=qm.PayloadField(key="type")),
+    qm.FieldCondition(key="type", match=qm.MatchValue(value="knowledge")),
+)
+_MEMORY_TYPE_COND = qm.FieldCondition(key="type", match=qm.MatchValue(value="memory"))
 
+_qdrant: AsyncQdrantClient | None = None
+_openai: AsyncOpenAI | None = None
 
-def _get_qdrant() -> QdrantClient:
+
+def _get_qdrant() -> AsyncQdrantClient:
     global _qdrant
     if _qdrant is None:
-        _qdrant = QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+        _qdrant = AsyncQdrantClient(
+            url=settings.qdrant_url,
+            api_key=settings.qdrant_api_key,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            timeout=settings.qdrant_timeout,
+        )
     return _qdrant
 
 
-def _get_openai() -> OpenAI:
+def _get_openai() -> AsyncOpenAI:
     global _openai
     if _openai is None:
-        _openai = OpenAI(api_key=settings.openai_api_key)
+        _openai = AsyncOpenAI(api_key=settings.openai_api_key)
     return _openai
 
 
-def _embed_query(text: str) -> List[float]:
+async def _embed_query(text: str) -> List[float]:
     """Generate embedding vector for a query using OpenAI."""
-    resp = _get_openai().embeddings.create(model=settings.openai_embeddings_model, input=text)
+    resp = await _get_openai().embeddings.create(model=settings.openai_embeddings_model, input=text)
     return resp.data[0].embedding
 
 
-def retrieve_rag(
+async def retrieve_rag(
     query_text: str,
     user_uid: str,
     collection: str = _COLLECTION,
@@ -56,7 +68,7 @@ def retrieve_rag(
         top_k = settings.qdrant_top_k
 
     try:
-        query_vec = _embed_query(query_text)
+        query_vec = await _embed_query(query_text)
     except Exception as exc:
         logger.warning("Embedding generation failed: %s", exc)
         return []
@@ -67,27 +79,17 @@ def retrieve_rag(
         # Filter: global knowledge (no type) OR explicit knowledge OR user memory
         flt = qm.Filter(
             should=[
-                qm.IsEmptyCondition(is_empty=qm.PayloadField(key="type")),
-                qm.FieldCondition(
-                    key="type",
-                    match=qm.MatchValue(value="knowledge"),
-                ),
+                *_KNOWLEDGE_CLAUSES,
                 qm.Filter(
                     must=[
-                        qm.FieldCondition(
-                            key="type",
-                            match=qm.MatchValue(value="memory"),
-                        ),
-                        qm.FieldCondition(
-                            key="user_uid",
-                            match=qm.MatchValue(value=user_uid),
-                        ),
+                        _MEMORY_TYPE_COND,
+                        qm.FieldCondition(key="user_uid", match=qm.MatchValue(value=user_uid)),
                     ]
                 ),
             ]
         )
 
-        response = client.query_points(
+        response = await client.query_points(
             collection_name=collection,
             query=query_vec,
             query_filter=flt,
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import threading
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Tuple
 
 from app.config import settings
 
-_buckets: Dict[str, Tuple[float, float]] = {}
+# user_uid -> (tokens, last_ts); least-recently-seen users are evicted past the cap.
+# Per-process state: with N workers a user effectively gets N x capacity.
+_buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_lock = threading.Lock()
+_MAX_BUCKETS = settings.rate_limit_max_buckets
 
 
 def allow(
@@ -13,11 +19,12 @@ def allow(
     capacity: float = settings.rate_limit_capacity,
     refill_per_sec: float = settings.rate_limit_refill_per_sec,
 ) -> bool:
-    now = time.time()
-    tokens, last_ts = _buckets.get(user_uid, (capacity, now))
-    tokens = min(capacity, tokens + (now - last_ts) * refill_per_sec)
-    if tokens < 1.0:
-        _buckets[user_uid] = (tokens, now)
-        return False
-    _buckets[user_uid] = (tokens - 1.0, now)
-    return True
+    now = time.monotonic()
+    with _lock:
+        tokens, last_ts = _buckets.pop(user_uid, (capacity, now))
+        tokens = min(capacity, tokens + (now - last_ts) * refill_per_sec)
+        allowed = tokens >= 1.0
+        _buckets[user_uid] = (tokens - 1.0 if allowed else tokens, now)
+        if len(_buckets) > _MAX_BUCKETS:
+            _buckets.popitem(last=False)
+    return allowed
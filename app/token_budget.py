@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 
 import tiktoken
 
@@ -14,11 +16,61 @@ from app.config import settings
 
 MAX_TOKENS = settings.max_context_tokens
 
+# Token counts of strings shorter than this (system prompt, RAG passages, short
+# turns) recur across turns and are memoized; longer strings are always encoded.
+_CACHE_MAX_CHARS = 4096
+_CACHE_MAX_ENTRIES = 4096
+
+# text -> token count, least-recently-used first
+_counts: "OrderedDict[str, int]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cached_count(text: str) -> Optional[int]:
+    if len(text) >= _CACHE_MAX_CHARS:
+        return None
+    with _lock:
+        n = _counts.get(text)
+        if n is not None:
+            _counts.move_to_end(text)
+        return n
+
+
+def _remember_count(text: str, n: int) -> None:
+    if len(text) >= _CACHE_MAX_CHARS:
+        return
+    with _lock:
+        _counts[text] = n
+        if len(_counts) > _CACHE_MAX_ENTRIES:
+            _counts.popitem(last=False)
+
 
 def count_tokens(text: str) -> int:
     if not text:
         return 0
-    return len(_ENC.encode(text))
+    n = _cached_count(text)
+    if n is None:
+        n = len(_ENC.encode(text))
+        _remember_count(text, n)
+    return n
+
+
+def count_tokens_batch(texts: List[str]) -> List[int]:
+    """Token counts for many strings; cache misses are encoded in a single tiktoken batch call."""
+    counts: List[int] = []
+    misses: List[int] = []
+    for i, t in enumerate(texts):
+        n = _cached_count(t) if t else 0
+        if n is None:
+            misses.append(i)
+            n = 0
+        counts.append(n)
+    if misses:
+        encoded = _ENC.encode_ordinary_batch([texts[i] for i in misses])
+        for i, tokens in zip(misses, encoded):
+            counts[i] = len(tokens)
+            _remember_count(texts[i], counts[i])
+    return counts
 
 
 def count_messages(messages: List[Dict[str, Any]]) -> int:
@@ -33,7 +85,11 @@ def trim_text_to_tokens(text: str, max_tok: int) -> str:
     """Truncate text so it fits within max_tok tokens."""
     if not text:
         return text
+    n = _cached_count(text)
+    if n is not None and n <= max_tok:
+        return text
     tokens = _ENC.encode(text)
+    _remember_count(text, len(tokens))
     if len(tokens) <= max_tok:
         return text
     return _ENC.decode(tokens[:max_tok])
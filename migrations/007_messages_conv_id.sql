@@ -0,0 +1,7 @@
+-- Migration 007: Index chat history reads by message id
+-- _SQL_HISTORY (fetch_history) and _SQL_HISTORY_WITH_TOTAL (fetch_history_with_total)
+-- take the newest N messages of a conversation ordered by id (keyset pagination
+-- via before_id); the total's COUNT(*) also scans this index.
+
+CREATE INDEX IF NOT EXISTS idx_messages_conv_id
+    ON chat_messages (conversation_id, id DESC);
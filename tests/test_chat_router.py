@@ -0,0 +1,108 @@
+"""
+Tests for chat_router streaming helpers.
+
+Covers:
+  _strip_meditation_tag — tag removal across chunk boundaries, with the
+                          streamed deltas matching the POST /v1/chat reply
+
+tiktoken cannot load its encoding offline, so the router fixture imports
+chat_router (and chat_service under it) against a token_budget stub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import random
+import sys
+import types
+
+import pytest
+
+_TAG = "[GENERATE_MEDITATION]"
+
+
+def _token_budget_stub() -> types.ModuleType:
+    module = types.ModuleType("app.token_budget")
+    module.MAX_TOKENS = 100_000
+    module.count_tokens = lambda text: len((text or "").split())
+    module.count_tokens_batch = lambda texts: [len((t or "").split()) for t in texts]
+    module.trim_text_to_tokens = lambda text, _max_tok: text
+    return module
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """A fresh app.chat_router bound to the token_budget stub; sys.modules is restored after."""
+    monkeypatch.setitem(sys.modules, "app.token_budget", _token_budget_stub())
+    # test_hrv_bpm_per_min.py installs MagicMocks for these when collected first
+    for name in ("app.config", "psycopg"):
+        if not isinstance(sys.modules.get(name, sys), types.ModuleType):
+            monkeypatch.delitem(sys.modules, name)
+    for name in ("app.chat_service", "app.chat_router"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module("app.chat_router")
+
+
+def _stream(router, chunks):
+    """Run chunks through _strip_meditation_tag; returns (deltas, done event)."""
+    async def _events():
+        for c in chunks:
+            yield {"delta": c}
+        yield {"done": True, "reply": "".join(chunks)}
+
+    async def _run():
+        return [ev async for ev in router._strip_meditation_tag(_events())]
+
+    out = asyncio.run(_run())
+    return [ev["delta"] for ev in out[:-1]], out[-1]
+
+
+def _chat_reply(reply):
+    """Reply text _chat_payload (POST /v1/chat) returns for the same model output."""
+    return reply.replace(_TAG, "").strip() if _TAG in reply else reply
+
+
+class TestStripMeditationTag:
+
+    def test_plain_reply_passes_through(self, router):
+        deltas, done = _stream(router, ["Hello ", "there, ", "how are you?"])
+        assert "".join(deltas) == "Hello there, how are you?"
+        assert done["done"] is True
+
+    def test_tag_in_one_chunk(self, router):
+        deltas, _ = _stream(router, ["Let's breathe together. ", _TAG])
+        assert "".join(deltas) == "Let's breathe together."
+        assert all(_TAG not in d for d in deltas)
+
+    def test_tag_split_across_chunks(self, router):
+        deltas, _ = _stream(router, ["Here you go. [GENER", "ATE_MEDI", "TATION]"])
+        assert "".join(deltas) == "Here you go."
+        assert all("[" not in d for d in deltas)
+
+    def test_partial_tag_prefix_is_released(self, router):
+        deltas, _ = _stream(router, ["Use [GEN", "TLE] breathing"])
+        assert "".join(deltas) == "Use [GENTLE] breathing"
+
+    def test_unfinished_prefix_at_end_is_flushed(self, router):
+        deltas, _ = _stream(router, ["Almost [GENERATE"])
+        assert "".join(deltas) == "Almost [GENERATE"
+
+    def test_trailing_whitespace_kept_without_tag(self, router):
+        deltas, _ = _stream(router, ["Done.", "\n"])
+        assert "".join(deltas) == "Done.\n"
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_splits_match_chat_reply(self, router, seed):
+        rng = random.Random(seed)
+        reply = rng.choice([
+            f"Take a slow breath. I'll prepare something calm. {_TAG}",
+            f"Sure.\n\n{_TAG}\n",
+            f"Try [box] breathing {_TAG} tonight.",
+            "No tag here, just [brackets] and [GEN text.",
+        ])
+        cuts = sorted(rng.sample(range(1, len(reply)), k=min(6, len(reply) - 1)))
+        chunks = [reply[i:j] for i, j in zip([0] + cuts, cuts + [len(reply)])]
+
+        deltas, _ = _stream(router, chunks)
+        assert "".join(deltas) == _chat_reply(reply)
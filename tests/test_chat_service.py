@@ -0,0 +1,278 @@
+"""
+Tests for chat_service prompt assembly and the HRV context cache.
+
+Covers:
+  _build_prompt — budget solver (fast path, history trimmed before RAG,
+                  exact token accounting)
+  _fetch_hrv_cached — in-flight dedup, TTL, eviction of failed / empty
+                      fetches, local path
+
+tiktoken cannot load its encoding offline, so the cs fixture imports
+chat_service against a whitespace word counter standing in for
+app.token_budget; every count below is in "words".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import importlib
+import sys
+import types
+
+import pytest
+
+
+def _token_budget_stub() -> types.ModuleType:
+    module = types.ModuleType("app.token_budget")
+    module.MAX_TOKENS = 100_000
+    module.count_tokens = lambda text: len((text or "").split())
+    module.count_tokens_batch = lambda texts: [len((t or "").split()) for t in texts]
+    module.trim_text_to_tokens = lambda text, max_tok: " ".join(text.split()[:max_tok])
+    return module
+
+
+@pytest.fixture
+def cs(monkeypatch):
+    """A fresh app.chat_service bound to the token_budget stub; sys.modules is restored after."""
+    monkeypatch.setitem(sys.modules, "app.token_budget", _token_budget_stub())
+    # test_hrv_bpm_per_min.py installs MagicMocks for these when collected first
+    for name in ("app.config", "psycopg"):
+        if not isinstance(sys.modules.get(name, sys), types.ModuleType):
+            monkeypatch.delitem(sys.modules, name)
+    monkeypatch.delitem(sys.modules, "app.chat_service", raising=False)
+    return importlib.import_module("app.chat_service")
+
+
+# ── Helpers ──────────────────────────────────────────────────────────
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def _history(n: int = 20):
+    return [
+        {"id": i, "role": "user" if i % 2 else "assistant", "content": ("w " * (i + 3)).strip()}
+        for i in range(n)
+    ]
+
+
+def _rag(n: int = 12):
+    return [{"text": ("r " * (5 + i)).strip()} for i in range(n)]
+
+
+def _build(cs):
+    return cs._build_prompt(
+        summary="sum",
+        memories=["m1"],
+        cross_chat_profile="prof",
+        history=_history(),
+        hrv_context={},
+        rag_hits=_rag(),
+        user_message="hello there",
+    )
+
+
+def _rag_message(messages):
+    return next((m for m in messages if m["content"].startswith("RAG_CONTEXT:")), None)
+
+
+def _history_messages(messages):
+    return [m for m in messages if m["role"] in ("user", "assistant")]
+
+
+# ── _build_prompt ────────────────────────────────────────────────────
+
+
+class TestBuildPromptBudget:
+
+    def test_fast_path_keeps_everything_without_searching(self, cs, monkeypatch):
+        def _no_search(*_args, **_kwargs):
+            raise AssertionError("bisect used although everything fits")
+
+        monkeypatch.setattr(cs, "MAX_TOKENS", 100_000)
+        monkeypatch.setattr(cs, "bisect_right", _no_search)
+        messages, breakdown = _build(cs)
+
+        assert len(_history_messages(messages)) == 15  # _RECENT_TURNS window
+        assert _rag_message(messages)["content"].count("\n- ") == 12  # one per snippet
+        assert breakdown["tokens_total"] <= 100_000
+
+    def test_history_trimmed_before_rag(self, cs, monkeypatch):
+        _, full = _build(cs)
+        # Room for every snippet but only part of the history
+        budget = full["tokens_total"] - full["tokens_history"] // 2
+        monkeypatch.setattr(cs, "MAX_TOKENS", budget)
+        messages, breakdown = _build(cs)
+
+        assert breakdown["tokens_rag"] == full["tokens_rag"]
+        assert 0 < breakdown["tokens_history"] < full["tokens_history"]
+        # The newest turns survive
+        kept = _history_messages(messages)
+        assert kept[-1]["content"] == _history()[-1]["content"]
+
+    def test_rag_trimmed_once_history_is_gone(self, cs, monkeypatch):
+        _, full = _build(cs)
+        fixed = full["tokens_total"] - full["tokens_rag"] - full["tokens_history"]
+        monkeypatch.setattr(cs, "MAX_TOKENS", fixed + full["tokens_rag"] // 2)
+        messages, breakdown = _build(cs)
+
+        assert breakdown["tokens_history"] == 0
+        assert _history_messages(messages) == []
+        assert 0 < breakdown["tokens_rag"] < full["tokens_rag"]
+
+    @pytest.mark.parametrize("budget", [100_000, 700, 550, 450, 400, 300, 250])
+    def test_total_matches_assembled_messages(self, cs, monkeypatch, budget):
+        monkeypatch.setattr(cs, "MAX_TOKENS", budget)
+        messages, breakdown = _build(cs)
+
+        # +4 per message, plus the user turn the caller appends
+        expected = sum(_words(m["content"]) + 4 for m in messages) + _words("hello there") + 4
+        assert breakdown["tokens_total"] == expected
+        assert breakdown["tokens_total"] <= budget
+
+    @pytest.mark.parametrize("budget", [550, 450, 400])
+    def test_history_fill_is_maximal(self, cs, monkeypatch, budget):
+        monkeypatch.setattr(cs, "MAX_TOKENS", budget)
+        messages, breakdown = _build(cs)
+
+        window = _history()[-15:]
+        kept = len(_history_messages(messages))
+        assert kept < len(window)
+        next_turn = window[-kept - 1]
+        assert breakdown["tokens_total"] + _words(next_turn["content"]) + 4 > budget
+
+
+# ── _fetch_hrv_cached ────────────────────────────────────────────────
+
+
+class _FakeFetch:
+    def __init__(self, result=None, error=None):
+        self.result = result or {}
+        self.error = error
+        self.calls = []
+        self.release = None  # optional asyncio.Event the fetch waits on
+
+    async def __call__(self, user_uid, hrv_range, **kwargs):
+        self.calls.append((user_uid, hrv_range, kwargs))
+        if self.release is not None:
+            await self.release.wait()
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return dict(self.result)
+
+
+@pytest.fixture
+def hrv(cs, monkeypatch):
+    """Remote HRV path with a controllable clock; returns (cs, clock)."""
+    clock = [1000.0]
+    monkeypatch.setattr(cs, "settings", dataclasses.replace(cs.settings, hrv_local=False))
+    monkeypatch.setattr(cs, "time", types.SimpleNamespace(monotonic=lambda: clock[0]))
+    monkeypatch.setattr(cs, "_HRV_CACHE_TTL", 60.0)
+    monkeypatch.setattr(cs, "_HRV_CACHE", {})
+    return cs, clock
+
+
+class TestFetchHrvCached:
+
+    def test_concurrent_turns_share_one_fetch(self, hrv, monkeypatch):
+        cs, _ = hrv
+        fetch = _FakeFetch({"daily_14d": [{"date": "2026-03-12"}]})
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            return await asyncio.gather(*(cs._fetch_hrv_cached("u1", "14d") for _ in range(3)))
+
+        results = asyncio.run(_run())
+        assert len(fetch.calls) == 1
+        assert all(r == fetch.result for r in results)
+
+    def test_refetches_after_ttl(self, hrv, monkeypatch):
+        cs, clock = hrv
+        fetch = _FakeFetch({"hrv_90d": {"trend": "stable"}})
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            await cs._fetch_hrv_cached("u1", "14d")
+            clock[0] += 59.0
+            await cs._fetch_hrv_cached("u1", "14d")
+            clock[0] += 2.0
+            await cs._fetch_hrv_cached("u1", "14d")
+
+        asyncio.run(_run())
+        assert len(fetch.calls) == 2
+
+    def test_keys_are_per_user_and_range(self, hrv, monkeypatch):
+        cs, _ = hrv
+        fetch = _FakeFetch({"hrv_90d": {"trend": "stable"}})
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            await cs._fetch_hrv_cached("u1", "14d")
+            await cs._fetch_hrv_cached("u2", "14d")
+            await cs._fetch_hrv_cached("u1", "90d")
+
+        asyncio.run(_run())
+        assert [c[:2] for c in fetch.calls] == [("u1", "14d"), ("u2", "14d"), ("u1", "90d")]
+
+    def test_empty_result_is_not_cached(self, hrv, monkeypatch):
+        cs, _ = hrv
+        fetch = _FakeFetch({})
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            await cs._fetch_hrv_cached("u1", "14d")
+            await cs._fetch_hrv_cached("u1", "14d")
+
+        asyncio.run(_run())
+        assert len(fetch.calls) == 2
+        assert cs._HRV_CACHE == {}
+
+    def test_failed_fetch_is_not_cached(self, hrv, monkeypatch):
+        cs, _ = hrv
+        fetch = _FakeFetch(error=RuntimeError("hrv api down"))
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            with pytest.raises(RuntimeError):
+                await cs._fetch_hrv_cached("u1", "14d")
+
+        asyncio.run(_run())
+        assert cs._HRV_CACHE == {}
+
+    def test_empty_result_evicted_when_first_caller_is_cancelled(self, hrv, monkeypatch):
+        cs, _ = hrv
+        fetch = _FakeFetch({})
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            fetch.release = asyncio.Event()
+            first = asyncio.create_task(cs._fetch_hrv_cached("u1", "14d"))
+            await asyncio.sleep(0)
+            first.cancel()
+            fetch.release.set()
+            _, (_, task) = next(iter(cs._HRV_CACHE.items()))
+            await task
+            await asyncio.sleep(0)
+
+        asyncio.run(_run())
+        assert cs._HRV_CACHE == {}
+
+    def test_local_path_is_not_cached(self, hrv, monkeypatch):
+        cs, _ = hrv
+        monkeypatch.setattr(
+            cs, "settings", dataclasses.replace(cs.settings, hrv_local=True, hrv_mode="compact")
+        )
+        fetch = _FakeFetch({"hrv_90d": {"trend": "stable"}})
+        monkeypatch.setattr(cs, "fetch_hrv_context", fetch)
+
+        async def _run():
+            await cs._fetch_hrv_cached("u1", "14d")
+            await cs._fetch_hrv_cached("u1", "14d")
+
+        asyncio.run(_run())
+        assert len(fetch.calls) == 2
+        assert fetch.calls[0][2] == {"mode": "compact"}
+        assert cs._HRV_CACHE == {}
@@ -0,0 +1,63 @@
+"""
+Database tests for the day-window filters in hrv_apple.py.
+
+Runs the queries through get_engine() (psycopg 3, server-side binds) against
+a temporary health_samples table that shadows the real one for the
+connection; nothing is committed. Skipped unless DATABASE_URL is set.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from sqlalchemy import text
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="DATABASE_URL not set (needs PostgreSQL)"
+)
+
+_UID = "test-hrv-apple-window"
+
+
+@pytest.fixture
+def conn():
+    from app.db import get_engine
+
+    with get_engine().connect() as conn:
+        conn.execute(
+            text("""
+                CREATE TEMP TABLE health_samples (
+                    id          BIGSERIAL PRIMARY KEY,
+                    user_id     TEXT        NOT NULL,
+                    sample_type TEXT        NOT NULL,
+                    start_time  TIMESTAMPTZ NOT NULL,
+                    value       NUMERIC
+                ) ON COMMIT DROP
+            """)
+        )
+        conn.execute(
+            text("""
+                INSERT INTO health_samples (user_id, sample_type, start_time, value)
+                VALUES (:uid, 'hrv', NOW() - INTERVAL '10 days', 40),
+                       (:uid, 'hrv', NOW() - INTERVAL '20 days', 60)
+            """),
+            {"uid": _UID},
+        )
+        yield conn
+        conn.rollback()
+
+
+class TestDayWindow:
+
+    @pytest.mark.parametrize("days, expected", [(5, 0), (14, 1), (30, 2)])
+    def test_daily_sdnn_range_respects_days(self, conn, days, expected):
+        from app.hrv_apple import _daily_from_apple_sdnn_range
+
+        assert len(_daily_from_apple_sdnn_range(conn, _UID, days)) == expected
+
+    def test_half_split_trend_uses_both_halves(self, conn):
+        from app.hrv_apple import _half_split_trend
+
+        # recent half (last 15 days) = 40, older half = 60
+        assert _half_split_trend(conn, _UID, "hrv", 30) == "declining"
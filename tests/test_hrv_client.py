@@ -0,0 +1,59 @@
+"""
+Tests for the pure shaping helpers in hrv_client.py.
+
+Covers _shape_daily_matrix: field selection, the 14-row window and rows
+with missing fields.
+"""
+
+from __future__ import annotations
+
+from app.hrv_client import _shape_daily_matrix
+
+
+def _row(day: int, **overrides):
+    row = {
+        "date": f"2026-03-{day:02d}",
+        "rmssd": 40.0 + day,
+        "sdnn": 50.0 + day,
+        "mean_hr": 60.0 + day,
+        "lf_hf_ratio": 1.5,
+        "pnn50": 12.0,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestShapeDailyMatrix:
+
+    def test_keeps_only_daily_fields_in_order(self):
+        out = _shape_daily_matrix([_row(1)])
+        assert out == [
+            {"date": "2026-03-01", "rmssd": 41.0, "sdnn": 51.0, "mean_hr": 61.0, "lf_hf_ratio": 1.5}
+        ]
+        assert list(out[0]) == ["date", "rmssd", "sdnn", "mean_hr", "lf_hf_ratio"]
+
+    def test_keeps_last_14_rows(self):
+        out = _shape_daily_matrix([_row(d) for d in range(1, 21)])
+        assert len(out) == 14
+        assert out[0]["date"] == "2026-03-07"
+        assert out[-1]["date"] == "2026-03-20"
+
+    def test_missing_fields_are_omitted(self):
+        partial = _row(2)
+        del partial["rmssd"]
+        del partial["lf_hf_ratio"]
+        out = _shape_daily_matrix([_row(1), partial, _row(3)])
+        assert out[1] == {"date": "2026-03-02", "sdnn": 52.0, "mean_hr": 62.0}
+        # Complete rows around a partial one are unaffected
+        assert len(out[0]) == 5
+        assert len(out[2]) == 5
+
+    def test_none_values_are_kept(self):
+        out = _shape_daily_matrix([_row(1, rmssd=None)])
+        assert out[0]["rmssd"] is None
+
+    def test_row_with_only_unrelated_keys(self):
+        assert _shape_daily_matrix([{"pnn50": 3.0}]) == [{}]
+
+    def test_empty_series(self):
+        assert _shape_daily_matrix([]) == []
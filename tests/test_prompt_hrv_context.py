@@ -10,6 +10,7 @@ def _install_token_budget_stub() -> None:
     module = types.ModuleType("app.token_budget")
     module.MAX_TOKENS = 100_000
     module.count_tokens = lambda text: len((text or "").split())
+    module.count_tokens_batch = lambda texts: [len((t or "").split()) for t in texts]
     module.trim_text_to_tokens = lambda text, _max_tok: text
     sys.modules["app.token_budget"] = module
 
@@ -0,0 +1,82 @@
+"""
+Tests for the per-user token-bucket rate limiter (app.rate_limit.allow).
+
+Covers refill over time and least-recently-seen bucket eviction. The clock
+is replaced so no test sleeps.
+"""
+
+from __future__ import annotations
+
+import types
+from collections import OrderedDict
+
+import pytest
+
+import app.rate_limit as rate_limit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(rate_limit, "_buckets", OrderedDict())
+    monkeypatch.setattr(rate_limit, "_MAX_BUCKETS", 1000)
+    return now
+
+
+def _allow(user_uid: str) -> bool:
+    return rate_limit.allow(user_uid, capacity=2.0, refill_per_sec=0.5)
+
+
+class TestRefill:
+
+    def test_new_user_starts_with_full_bucket(self, clock):
+        assert _allow("u1")
+        assert _allow("u1")
+        assert not _allow("u1")
+
+    def test_bucket_refills_with_elapsed_time(self, clock):
+        _allow("u1")
+        _allow("u1")
+        assert not _allow("u1")
+        clock[0] += 2.0  # 0.5 tokens/s -> one token
+        assert _allow("u1")
+        assert not _allow("u1")
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        _allow("u1")
+        clock[0] += 3600.0
+        assert _allow("u1")
+        assert _allow("u1")
+        assert not _allow("u1")
+
+    def test_users_have_independent_buckets(self, clock):
+        _allow("u1")
+        _allow("u1")
+        assert not _allow("u1")
+        assert _allow("u2")
+
+
+class TestEviction:
+
+    def test_least_recently_seen_user_is_evicted(self, monkeypatch, clock):
+        monkeypatch.setattr(rate_limit, "_MAX_BUCKETS", 2)
+        _allow("u1")
+        _allow("u2")
+        _allow("u1")  # u1 is now the most recent
+        _allow("u3")
+        assert list(rate_limit._buckets) == ["u1", "u3"]
+
+    def test_bucket_count_stays_at_cap(self, monkeypatch, clock):
+        monkeypatch.setattr(rate_limit, "_MAX_BUCKETS", 3)
+        for i in range(10):
+            _allow(f"u{i}")
+        assert list(rate_limit._buckets) == ["u7", "u8", "u9"]
+
+    def test_evicted_user_gets_a_fresh_bucket(self, monkeypatch, clock):
+        monkeypatch.setattr(rate_limit, "_MAX_BUCKETS", 1)
+        _allow("u1")
+        _allow("u1")
+        assert not _allow("u1")
+        _allow("u2")  # evicts u1
+        assert _allow("u1")